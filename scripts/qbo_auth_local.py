@@ -86,17 +86,19 @@ def main() -> None:
         )
 
     state = _CallbackState()
+    callback_path = local_parsed.path
 
     class Handler(BaseHTTPRequestHandler):
         def do_GET(self):  # noqa: N802
+            request_url = urlparse(self.path)
             # Only accept the configured callback path
-            if urlparse(self.path).path != local_parsed.path:
+            if request_url.path != callback_path:
                 self.send_response(404)
                 self.end_headers()
                 self.wfile.write(b"Not found")
                 return
 
-            query = parse_qs(urlparse(self.path).query)
+            query = parse_qs(request_url.query)
             if "error" in query:
                 state.error = query.get("error", [""])[0]
             state.code = query.get("code", [None])[0]
@@ -174,10 +176,19 @@ def main() -> None:
         "refresh_token": auth_client.refresh_token,
         "id_token": auth_client.id_token,
         "saved_at_unix": int(time.time()),
+        # Lets QBOClient skip the OAuth refresh round trip while the access token is valid.
+        "expires_at_unix": (
+            int(time.time()) + int(auth_client.expires_in) if auth_client.expires_in else None
+        ),
     }
 
-    with open(TOKENS_PATH, "w", encoding="utf-8") as f:
+    # Write-then-rename so a crash mid-write never leaves a truncated token file.
+    tmp_path = f"{TOKENS_PATH}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
         json.dump(payload, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, TOKENS_PATH)
 
     print("\n✅ Success. Tokens saved to:")
     print(f"   {TOKENS_PATH}")
@@ -11,6 +11,7 @@ Safe output policy:
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 import os
 from pathlib import Path
@@ -34,6 +35,46 @@ class ProbeAttempt:
     params: dict[str, str]
 
 
+# (report_name, date param) pairs to probe, most likely to succeed first.
+# We try both param styles because Intuit docs vary:
+# - Many reports accept end_date
+# - Some doc pages show report_date
+_PROBE_SPECS: tuple[tuple[str, str], ...] = (
+    # Canonical aging reports (often work even when Summary/Detail is denied)
+    ("AgedPayables", "report_date"),
+    ("AgedReceivables", "report_date"),
+
+    # Aged* variants
+    ("AgedPayablesSummary", "report_date"),
+    ("AgedPayablesDetail", "report_date"),
+    ("AgedReceivablesSummary", "report_date"),
+    ("AgedReceivablesDetail", "report_date"),
+
+    # AP/AR Aging variants from docs
+    ("APAgingSummary", "report_date"),
+    ("APAgingDetail", "report_date"),
+    ("ARAgingSummary", "report_date"),
+    ("ARAgingDetail", "report_date"),
+
+    # Same names but with end_date param, just in case this tenant expects it
+    ("APAgingSummary", "end_date"),
+    ("APAgingDetail", "end_date"),
+    ("ARAgingSummary", "end_date"),
+    ("ARAgingDetail", "end_date"),
+)
+
+
+def _build_candidates(end_date: str) -> tuple[ProbeAttempt, ...]:
+    """Build probe attempts in priority order, dropping duplicate (name, params) pairs."""
+
+    unique: dict[tuple[str, str], ProbeAttempt] = {}
+    for report_name, param in _PROBE_SPECS:
+        unique.setdefault(
+            (report_name, param), ProbeAttempt(report_name, {param: end_date})
+        )
+    return tuple(unique.values())
+
+
 def _header_brief(report: dict[str, Any]) -> dict[str, Any]:
     h = report.get("Header")
     if not isinstance(h, dict):
@@ -69,9 +110,31 @@ def _looks_like_5020_reportname_permission_denied(err: Exception) -> bool:
     )
 
 
+def _probe(
+    qbo: QBOClient, attempt: ProbeAttempt
+) -> tuple[dict[str, Any] | None, Exception | None]:
+    """Run a single probe; returns (report, None) on success or (None, error)."""
+
+    try:
+        return qbo._get_report(report_name=attempt.report_name, params=attempt.params), None
+    except Exception as e:
+        return None, e
+
+
 def main() -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--end-date", required=True, help="YYYY-MM-DD")
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=8,
+        help="Number of probes to run concurrently (default: 8)",
+    )
+    parser.add_argument(
+        "--stop-on-first-ok",
+        action="store_true",
+        help="Cancel outstanding probes once any report name succeeds",
+    )
     args = parser.parse_args()
 
     # Avoid python-dotenv find_dotenv() issues in inline execution contexts.
@@ -81,73 +144,74 @@ def main() -> int:
 
     end_date = args.end_date
 
-    # We try both param styles because Intuit docs vary:
-    # - Many reports accept end_date
-    # - Some doc pages show report_date
-    candidates: list[ProbeAttempt] = [
-        # Canonical aging reports (often work even when Summary/Detail is denied)
-        ProbeAttempt("AgedPayables", {"report_date": end_date}),
-        ProbeAttempt("AgedReceivables", {"report_date": end_date}),
-
-        # Aged* variants
-        ProbeAttempt("AgedPayablesSummary", {"report_date": end_date}),
-        ProbeAttempt("AgedPayablesDetail", {"report_date": end_date}),
-        ProbeAttempt("AgedReceivablesSummary", {"report_date": end_date}),
-        ProbeAttempt("AgedReceivablesDetail", {"report_date": end_date}),
-
-        # AP/AR Aging variants from docs
-        ProbeAttempt("APAgingSummary", {"report_date": end_date}),
-        ProbeAttempt("APAgingDetail", {"report_date": end_date}),
-        ProbeAttempt("ARAgingSummary", {"report_date": end_date}),
-        ProbeAttempt("ARAgingDetail", {"report_date": end_date}),
-
-        # Same names but with end_date param, just in case this tenant expects it
-        ProbeAttempt("APAgingSummary", {"end_date": end_date}),
-        ProbeAttempt("APAgingDetail", {"end_date": end_date}),
-        ProbeAttempt("ARAgingSummary", {"end_date": end_date}),
-        ProbeAttempt("ARAgingDetail", {"end_date": end_date}),
-    ]
-
-    ok: list[tuple[str, dict[str, str]]] = []
-    denied_5020: list[tuple[str, dict[str, str], str]] = []
-    other_err: list[tuple[str, dict[str, str], str]] = []
+    candidates = _build_candidates(end_date)
+
+    ok: list[tuple[int, str, dict[str, str]]] = []
+    denied_5020: list[tuple[int, str, dict[str, str], str]] = []
+    other_err: list[tuple[int, str, dict[str, str], str]] = []
 
     print(f"Probing aging report names for end_date={end_date}")
     print("Token source: .env_qbo_tokens.json (values not printed)")
 
-    for attempt in candidates:
-        print("\n---")
-        print("Report:", attempt.report_name)
-        print("Params:", attempt.params)
-
-        try:
-            report = qbo._get_report(report_name=attempt.report_name, params=attempt.params)
-        except Exception as e:
-            if _looks_like_5020_reportname_permission_denied(e):
-                denied_5020.append((attempt.report_name, attempt.params, str(e)))
-                print("RESULT: DENIED (5020 ReportName Permission Denied)")
-            else:
-                other_err.append((attempt.report_name, attempt.params, str(e)))
-                print("RESULT: ERROR")
-            print("Error:", str(e))
-            continue
-
-        ok.append((attempt.report_name, attempt.params))
-        print("RESULT: OK")
-        print("Header:", _header_brief(report))
-        print("Columns:", _column_titles(report))
+    # Each probe is a blocking HTTPS round trip, so run them concurrently and
+    # report results as they complete. The summary below keeps candidate order.
+    with ThreadPoolExecutor(max_workers=max(1, args.max_workers)) as executor:
+        futures = {
+            executor.submit(_probe, qbo, attempt): idx
+            for idx, attempt in enumerate(candidates)
+        }
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                idx = futures[future]
+                attempt = candidates[idx]
+                report, err = future.result()
+
+                print("\n---")
+                print("Report:", attempt.report_name)
+                print("Params:", attempt.params)
+
+                if err is not None:
+                    if _looks_like_5020_reportname_permission_denied(err):
+                        denied_5020.append((idx, attempt.report_name, attempt.params, str(err)))
+                        print("RESULT: DENIED (5020 ReportName Permission Denied)")
+                    else:
+                        other_err.append((idx, attempt.report_name, attempt.params, str(err)))
+                        print("RESULT: ERROR")
+                    print("Error:", str(err))
+                    continue
+
+                ok.append((idx, attempt.report_name, attempt.params))
+                print("RESULT: OK")
+                print("Header:", _header_brief(report or {}))
+                print("Columns:", _column_titles(report or {}))
+
+            if args.stop_on_first_ok and ok and pending:
+                # Probes already in flight still finish; their results are dropped.
+                for future in pending:
+                    future.cancel()
+                print(f"\nStopping early: dropping {len(pending)} outstanding probe(s)")
+                break
+
+    # All probes share the client's pooled session; release it once they are done.
+    qbo.close()
+
+    ok.sort()
+    denied_5020.sort()
+    other_err.sort()
 
     print("\n==================== SUMMARY ====================")
     print("OK:")
-    for name, params in ok:
+    for _, name, params in ok:
         print(" -", name, params)
 
     print("\nDENIED 5020:")
-    for name, params, _ in denied_5020:
+    for _, name, params, _ in denied_5020:
         print(" -", name, params)
 
     print("\nOTHER ERRORS:")
-    for name, params, _ in other_err:
+    for _, name, params, _ in other_err:
         print(" -", name, params)
 
     return 0
@@ -1,6 +1,7 @@
 import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 from dotenv import load_dotenv
 
@@ -53,24 +54,49 @@ if not SPREADSHEET_ID:
 sa = json.load(open(os.path.expanduser(SA_PATH)))
 creds = service_account.Credentials.from_service_account_info(sa, scopes=SCOPES)
 
-drive = build("drive", "v3", credentials=creds)
-print("Drive files:", drive.files().list(pageSize=5, fields="files(id,name)").execute().get("files", []))
+def fetch_values(read_range):
+    # googleapiclient service objects are not thread-safe, so each worker builds its own.
+    svc = build("sheets", "v4", credentials=creds)
+    return svc.spreadsheets().values().get(spreadsheetId=SPREADSHEET_ID, range=read_range).execute()
 
-sheets = build("sheets", "v4", credentials=creds)
 
-# Helper: list sheet titles
-meta = sheets.spreadsheets().get(spreadsheetId=SPREADSHEET_ID, fields="sheets(properties(title))").execute()
-sheet_titles = [s['properties']['title'] for s in meta.get('sheets', [])]
-print(f"Available sheets: {sheet_titles}")
+def list_drive_files():
+    drive = build("drive", "v3", credentials=creds)
+    return drive.files().list(pageSize=5, fields="files(id,name)").execute().get("files", [])
 
-# Determine target sheet and range
-TARGET_SHEET = os.environ.get('SEARCH_SHEET') or sheet_titles[0]
-print(f"Target sheet: {TARGET_SHEET}")
-READ_RANGE = os.environ.get('SEARCH_RANGE') or f"'{TARGET_SHEET}'!A1:Z1000"
-print(f"Reading range: {READ_RANGE}")
 
-# Fetch rows
-resp = sheets.spreadsheets().values().get(spreadsheetId=SPREADSHEET_ID, range=READ_RANGE).execute()
+SEARCH_SHEET = os.environ.get('SEARCH_SHEET')
+SEARCH_RANGE = os.environ.get('SEARCH_RANGE')
+
+# The Drive listing, the sheet-title lookup and (when the range is known up front)
+# the values read are independent round trips, so issue them concurrently.
+with ThreadPoolExecutor(max_workers=2) as pool:
+    drive_future = pool.submit(list_drive_files)
+    values_future = None
+    if SEARCH_RANGE or SEARCH_SHEET:
+        values_future = pool.submit(fetch_values, SEARCH_RANGE or f"'{SEARCH_SHEET}'!A1:Z1000")
+
+    sheets = build("sheets", "v4", credentials=creds)
+
+    # Helper: list sheet titles
+    meta = sheets.spreadsheets().get(spreadsheetId=SPREADSHEET_ID, fields="sheets(properties(title))").execute()
+    sheet_titles = [s['properties']['title'] for s in meta.get('sheets', [])]
+
+    print("Drive files:", drive_future.result())
+    print(f"Available sheets: {sheet_titles}")
+
+    # Determine target sheet and range
+    TARGET_SHEET = SEARCH_SHEET or sheet_titles[0]
+    print(f"Target sheet: {TARGET_SHEET}")
+    READ_RANGE = SEARCH_RANGE or f"'{TARGET_SHEET}'!A1:Z1000"
+    print(f"Reading range: {READ_RANGE}")
+
+    # Fetch rows
+    if values_future is not None:
+        resp = values_future.result()
+    else:
+        resp = sheets.spreadsheets().values().get(spreadsheetId=SPREADSHEET_ID, range=READ_RANGE).execute()
+
 rows = resp.get('values', [])
 print(f"Fetched {len(rows)} rows from sheet '{TARGET_SHEET}'")
 
@@ -81,8 +107,11 @@ SEARCH_COL_HEADER = os.environ.get('SEARCH_COL_HEADER', 'Nov. 2025')
 # Normalize helper
 import re
 
+_NON_WORD_RE = re.compile(r"[^\w]")
+
+
 def norm(s):
-    return re.sub(r"[^\w]", "", s).lower() if s is not None else ""
+    return _NON_WORD_RE.sub("", s).lower() if s is not None else ""
 
 # Find header row (first non-empty row) and column index
 header_row_idx = None
@@ -108,16 +137,12 @@ else:
     else:
         print(f"Found column '{header[target_col_idx]}' at index {target_col_idx}")
 
-# Find the row that has the SEARCH_ROW_KEY
-row_idx = None
+# Find the row that has the SEARCH_ROW_KEY.
+# Normalize each row once into a single string; normalized cells never contain
+# spaces, so joining on " " cannot create matches that span two cells.
+row_norms = [" ".join(norm(cell) for cell in r) for r in rows]
 search_row_norm = norm(SEARCH_ROW_KEY)
-for i, r in enumerate(rows):
-    for cell in r:
-        if search_row_norm in norm(cell):
-            row_idx = i
-            break
-    if row_idx is not None:
-        break
+row_idx = next((i for i, rn in enumerate(row_norms) if search_row_norm in rn), None)
 
 if row_idx is None:
     print(f"Row containing '{SEARCH_ROW_KEY}' not found")
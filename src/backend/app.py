@@ -1,21 +1,30 @@
 import asyncio
+import functools
 import json
 import logging
+import secrets
 import sys
-import uuid
 
 from contextlib import asynccontextmanager
 from typing import Any
 
 from src.backend.common.config.app_config import config
-from src.backend.common.models.messages_af import InputTask, UserLanguage
+from src.backend.common.models.messages_af import (
+    InputTask,
+    Plan,
+    TeamConfiguration,
+    UserLanguage,
+)
 
 # FastAPI imports
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from pydantic import ValidationError
 
 # Local imports
 from src.backend.middleware.health_check import HealthCheckMiddleware
+from src.backend.v4.api.plan_router import cancel_orchestrations
 from src.backend.v4.api.router import app_v4
 
 from src.backend.v4.config.agent_registry import agent_registry
@@ -26,27 +35,32 @@ from src.backend.v4.config.agent_registry import agent_registry
 # refer to the same module object.
 sys.modules.setdefault("app", sys.modules[__name__])
 
+logger = logging.getLogger(__name__)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage FastAPI application lifecycle - startup and shutdown."""
-    logger = logging.getLogger(__name__)
-
     # Startup
     logger.info("🚀 Starting MACAE application...")
     yield
 
     # Shutdown
     logger.info("🛑 Shutting down MACAE application...")
+    try:
+        # Stop in-flight plans before their agents are torn down underneath them
+        await cancel_orchestrations()
+    except Exception as e:
+        logger.error("❌ Error cancelling orchestrations: %s", e)
     try:
         # Clean up all agents from Azure AI Foundry when container stops
         await agent_registry.cleanup_all_agents()
         logger.info("✅ Agent cleanup completed successfully")
 
     except ImportError as ie:
-        logger.error(f"❌ Could not import agent_registry: {ie}")
+        logger.error("❌ Could not import agent_registry: %s", ie)
     except Exception as e:
-        logger.error(f"❌ Error during shutdown cleanup: {e}")
+        logger.error("❌ Error during shutdown cleanup: %s", e)
 
     logger.info("👋 MACAE application shutdown complete")
 
@@ -75,20 +89,18 @@ else:
     )
 
 # Configure logging levels from environment variables
-logging.basicConfig(level=getattr(logging, config.AZURE_BASIC_LOGGING_LEVEL.upper(), logging.INFO))
+_LOG_LEVELS = logging.getLevelNamesMapping()
+logging.basicConfig(level=_LOG_LEVELS.get(config.AZURE_BASIC_LOGGING_LEVEL.upper(), logging.INFO))
 
 # Configure Azure package logging levels
-azure_level = getattr(logging, config.AZURE_PACKAGE_LOGGING_LEVEL.upper(), logging.WARNING)
-# Parse comma-separated logging packages
-if config.AZURE_LOGGING_PACKAGES:
-    packages = [pkg.strip() for pkg in config.AZURE_LOGGING_PACKAGES.split(",") if pkg.strip()]
-    for logger_name in packages:
-        logging.getLogger(logger_name).setLevel(azure_level)
+azure_level = _LOG_LEVELS.get(config.AZURE_PACKAGE_LOGGING_LEVEL.upper(), logging.WARNING)
+for logger_name in config.AZURE_LOGGING_PACKAGE_NAMES:
+    logging.getLogger(logger_name).setLevel(azure_level)
 
 logging.getLogger("opentelemetry.sdk").setLevel(logging.ERROR)
 
-# Initialize the FastAPI app
-app = FastAPI(lifespan=lifespan)
+# Initialize the FastAPI app (orjson serializes responses in C instead of stdlib json)
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 frontend_url = config.FRONTEND_SITE_NAME
 
@@ -96,16 +108,24 @@ frontend_url = config.FRONTEND_SITE_NAME
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Allow all origins for development; restrict in production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    # Browsers ignore credentials with a wildcard origin, and the frontend sends none.
+    allow_credentials=False,
+    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+    # The headers the frontend actually sends (see src/frontend/src/api).
+    allow_headers=[
+        "authorization",
+        "content-type",
+        "x-ms-client-principal-id",
+        "x-ms-client-principal-name",
+    ],
+    max_age=86400,  # Let browsers cache preflight responses for 24h
 )
 
 # Configure health check
 app.add_middleware(HealthCheckMiddleware, password="", checks={})
 # v4 endpoints
 app.include_router(app_v4)
-logging.info("Added health check middleware")
+logger.info("Added health check middleware")
 
 
 def track_event_if_configured(event_name: str, properties: dict[str, Any] | None = None) -> None:
@@ -116,12 +136,13 @@ def track_event_if_configured(event_name: str, properties: dict[str, Any] | None
 
     try:
         from src.backend.common.utils.event_utils import track_event_if_configured as _track
-
-        _track(event_name, properties or {})
-    except Exception:
+    except ImportError:
         # Best-effort: never fail request handling due to telemetry.
         return
 
+    # `_track` already swallows and logs Azure Monitor errors.
+    _track(event_name, properties or {})
+
 
 async def initialize_runtime_and_context(*, user_id: str) -> tuple[Any, Any]:
     """Initialize runtime context needed for request processing.
@@ -143,6 +164,29 @@ def _default_local_rai_check(text: str) -> bool:
     return not any(t in lowered for t in blocked_terms)
 
 
+@functools.lru_cache(maxsize=1)
+def _rai_team_template():
+    """Minimal team config for the RAI agent, built once; it is never mutated."""
+
+    # Callers in the v4 router pass a real team config.
+    return TeamConfiguration(
+        id=secrets.token_hex(16),
+        session_id="",
+        team_id="rai_team",
+        name="RAI Team",
+        status="active",
+        created="",
+        created_by="",
+        agents=[],
+        description="",
+        logo="",
+        plan="",
+        starting_tasks=[],
+        deployment_name=config.AZURE_OPENAI_RAI_DEPLOYMENT_NAME,
+        user_id="rai",
+    )
+
+
 async def rai_success(description: str, *args, **kwargs) -> bool:
     """RAI check wrapper.
 
@@ -155,35 +199,21 @@ async def rai_success(description: str, *args, **kwargs) -> bool:
         return _default_local_rai_check(description)
 
     try:
-        from src.backend.common.utils.utils_af import rai_success as _rai_success
-        from src.backend.common.models.messages_af import TeamConfiguration
         from src.backend.common.database.database_factory import DatabaseFactory
+        from src.backend.common.utils.utils_af import rai_success as _rai_success
+    except ImportError as e:
+        logger.error("RAI check unavailable (%s); blocking by default.", e)
+        return False
 
-        # Minimal team config for the RAI agent; callers in the v4 router pass a real one.
+    try:
+        # DatabaseFactory returns the process-wide client.
         memory_store = await DatabaseFactory.get_database(user_id="rai")
-        team = TeamConfiguration(
-            id=str(uuid.uuid4()),
-            session_id=str(uuid.uuid4()),
-            team_id="rai_team",
-            name="RAI Team",
-            status="active",
-            created="",
-            created_by="",
-            agents=[],
-            description="",
-            logo="",
-            plan="",
-            starting_tasks=[],
-            deployment_name=config.AZURE_OPENAI_RAI_DEPLOYMENT_NAME,
-            user_id="rai",
-        )
-        return await _rai_success(description, team, memory_store)
-    except Exception:
+    except Exception as e:  # Cosmos/credential failures surface as assorted SDK errors.
+        logger.error("RAI setup failed (%s); blocking by default.", e)
         return False
 
-
-async def _maybe_await(value):
-    return await value if asyncio.iscoroutine(value) else value
+    # `_rai_success` handles its own errors and fails closed.
+    return await _rai_success(description, _rai_team_template(), memory_store)
 
 
 @app.post("/input_task")
@@ -194,16 +224,17 @@ async def input_task(request: Request):
     - Returns 422 on pydantic validation errors
     """
 
+    # Parse and validate the raw body in a single pass through pydantic-core.
+    body = await request.body()
     try:
-        payload = await request.json()
-    except Exception:
-        raise HTTPException(status_code=400, detail="Invalid JSON")
-
-    try:
-        InputTask(**payload)
-    except Exception as e:
-        # Match FastAPI validation shape sufficiently for tests
-        raise HTTPException(status_code=422, detail=str(e))
+        InputTask.model_validate_json(body)
+    except ValidationError as e:
+        if any(err["type"] == "json_invalid" for err in e.errors()):
+            raise HTTPException(status_code=400, detail="Invalid JSON")
+        # Match FastAPI's request-validation error shape
+        raise HTTPException(
+            status_code=422, detail=e.errors(include_url=False, include_context=False)
+        )
 
     return {"status": "ok"}
 
@@ -224,8 +255,11 @@ async def process_request(input_task: InputTask, request: Request):
     if not user_id:
         raise HTTPException(status_code=400, detail="no user found")
 
-    # Run RAI check (supports being patched with a sync function in unit tests)
-    ok = await _maybe_await(rai_success(input_task.description))
+    # Run RAI check (supports being patched with a sync function in unit tests).
+    # The coroutine checks are inlined: these calls sit on the per-request hot path.
+    ok = rai_success(input_task.description)
+    if asyncio.iscoroutine(ok):
+        ok = await ok
     if not ok:
         track_event_if_configured(
             "RAI failed",
@@ -241,22 +275,23 @@ async def process_request(input_task: InputTask, request: Request):
         )
 
     # Allow unit tests to patch runtime/memory initialization.
-    _, memory_store = await _maybe_await(initialize_runtime_and_context(user_id=user_id))
-
-    plan_id = str(uuid.uuid4())
-    try:
-        from src.backend.common.models.messages_af import Plan
-
-        plan = Plan(
-            plan_id=plan_id,
-            session_id=input_task.session_id,
-            user_id=user_id,
-            initial_goal=input_task.description,
-        )
-    except Exception:
-        plan = {"plan_id": plan_id, "session_id": input_task.session_id}
+    runtime = initialize_runtime_and_context(user_id=user_id)
+    if asyncio.iscoroutine(runtime):
+        runtime = await runtime
+    _, memory_store = runtime
+
+    # IDs are opaque strings downstream; a 32-char hex token skips UUID formatting.
+    plan_id = secrets.token_hex(16)
+    plan = Plan(
+        plan_id=plan_id,
+        session_id=input_task.session_id,
+        user_id=user_id,
+        initial_goal=input_task.description,
+    )
 
-    await _maybe_await(memory_store.add_plan(plan))
+    added = memory_store.add_plan(plan)
+    if asyncio.iscoroutine(added):
+        await added
 
     return {
         "status": "Plan created successfully",
@@ -292,7 +327,7 @@ async def user_browser_language_endpoint(user_language: UserLanguage, request: R
     config.set_user_local_browser_language(user_language.language)
 
     # Log the received language for the user
-    logging.info(f"Received browser language '{user_language}' for user ")
+    logger.info("Received browser language '%s' for user", user_language.language)
 
     return {"status": "Language received successfully"}
 
@@ -308,4 +343,7 @@ if __name__ == "__main__":
         reload=True,
         log_level="info",
         access_log=False,
+        # C event loop and HTTP parser (uvicorn[standard]); uvloop has no Windows build.
+        loop="auto" if sys.platform == "win32" else "uvloop",
+        http="httptools",
     )
@@ -79,6 +79,12 @@ class AppConfig:
         self.AZURE_BASIC_LOGGING_LEVEL = self._get_optional("AZURE_BASIC_LOGGING_LEVEL", "INFO")
         self.AZURE_PACKAGE_LOGGING_LEVEL = self._get_optional("AZURE_PACKAGE_LOGGING_LEVEL", "WARNING")
         self.AZURE_LOGGING_PACKAGES = self._get_optional("AZURE_LOGGING_PACKAGES")
+        # Comma-separated AZURE_LOGGING_PACKAGES, parsed once.
+        self.AZURE_LOGGING_PACKAGE_NAMES: tuple[str, ...] = tuple(
+            pkg.strip()
+            for pkg in (self.AZURE_LOGGING_PACKAGES or "").split(",")
+            if pkg.strip()
+        )
 
         # Optional MCP server endpoint (for local MCP server or remote)
         # Example: http://127.0.0.1:8000/mcp
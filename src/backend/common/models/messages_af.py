@@ -3,9 +3,10 @@ Agent Framework model equivalents for former agent framework -backed data models
 
 """
 
-import uuid
+import secrets
 from datetime import datetime, timezone
 from enum import Enum
+from functools import partial
 from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
@@ -40,6 +41,11 @@ class AgentType(str, Enum):
     # Extend as needed
 
 
+# Plain-string values for call sites that need the str rather than the member.
+HUMAN_AGENT_VALUE: str = AgentType.HUMAN.value
+PLANNER_AGENT_VALUE: str = AgentType.PLANNER.value
+
+
 class StepStatus(str, Enum):
     planned = "planned"
     awaiting_feedback = "awaiting_feedback"
@@ -50,6 +56,19 @@ class StepStatus(str, Enum):
     failed = "failed"
 
 
+# Order matches the PlanWithSteps count fields assigned in update_step_counts.
+_STATUS_ORDER = (
+    StepStatus.planned,
+    StepStatus.awaiting_feedback,
+    StepStatus.approved,
+    StepStatus.rejected,
+    StepStatus.action_requested,
+    StepStatus.completed,
+    StepStatus.failed,
+)
+_STATUS_INDEX = {status: i for i, status in enumerate(_STATUS_ORDER)}
+
+
 class PlanStatus(str, Enum):
     in_progress = "in_progress"
     completed = "completed"
@@ -82,11 +101,17 @@ class AgentMessageType(str, Enum):
 # Base Models
 # ---------------------------------------------------------------------------
 
+# Default factories as C-level partials, so no Python frame per model.
+_utcnow = partial(datetime.now, timezone.utc)
+# IDs are opaque strings; 32 hex chars skip building and formatting a UUID object.
+_new_id = partial(secrets.token_hex, 16)
+
+
 class BaseDataModel(BaseModel):
     """Base data model with common fields."""
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    session_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    timestamp: Optional[datetime] = Field(default_factory=lambda: datetime.now(timezone.utc))
+    id: str = Field(default_factory=_new_id)
+    session_id: str = Field(default_factory=_new_id)
+    timestamp: Optional[datetime] = Field(default_factory=_utcnow)
 
 
 class AgentMessage(BaseDataModel):
@@ -128,12 +153,12 @@ class CurrentTeamAgent(BaseDataModel):
 class Plan(BaseDataModel):
     """Represents a plan containing multiple steps."""
     data_type: Literal[DataType.plan] = DataType.plan
-    plan_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    plan_id: str = Field(default_factory=_new_id)
     user_id: str
     initial_goal: str
     overall_status: PlanStatus = PlanStatus.in_progress
     approved: bool = False
-    source: str = AgentType.PLANNER.value
+    source: str = PLANNER_AGENT_VALUE
     m_plan: Optional[Dict[str, Any]] = None
     summary: Optional[str] = None
     team_id: Optional[str] = None
@@ -192,7 +217,7 @@ class TeamConfiguration(BaseDataModel):
     """Represents a team configuration stored in the database."""
     team_id: str
     data_type: Literal[DataType.team_config] = DataType.team_config
-    session_id: str = Field(default_factory=lambda: str(uuid.uuid4()))  # partition key
+    session_id: str = Field(default_factory=_new_id)  # partition key
     name: str
     status: str
     created: str
@@ -220,26 +245,23 @@ class PlanWithSteps(Plan):
 
     def update_step_counts(self) -> None:
         """Update the counts of steps by their status."""
-        status_counts = {
-            StepStatus.planned: 0,
-            StepStatus.awaiting_feedback: 0,
-            StepStatus.approved: 0,
-            StepStatus.rejected: 0,
-            StepStatus.action_requested: 0,
-            StepStatus.completed: 0,
-            StepStatus.failed: 0,
-        }
+        tally = [0] * len(_STATUS_ORDER)
+        index = _STATUS_INDEX
         for step in self.steps:
-            status_counts[step.status] += 1
+            i = index.get(step.status)
+            if i is not None:
+                tally[i] += 1
 
         self.total_steps = len(self.steps)
-        self.planned = status_counts[StepStatus.planned]
-        self.awaiting_feedback = status_counts[StepStatus.awaiting_feedback]
-        self.approved_count = status_counts[StepStatus.approved]
-        self.rejected = status_counts[StepStatus.rejected]
-        self.action_requested = status_counts[StepStatus.action_requested]
-        self.completed = status_counts[StepStatus.completed]
-        self.failed = status_counts[StepStatus.failed]
+        (
+            self.planned,
+            self.awaiting_feedback,
+            self.approved_count,
+            self.rejected,
+            self.action_requested,
+            self.completed,
+            self.failed,
+        ) = tally
 
         # Mark the plan as complete if the sum of completed and failed steps equals the total number of steps
         if self.total_steps > 0 and (self.completed + self.failed) == self.total_steps:
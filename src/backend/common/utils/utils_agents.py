@@ -1,7 +1,6 @@
 
 import logging
 import secrets
-import string
 from typing import Optional
 
 from src.backend.common.database.database_base import DatabaseBase
@@ -15,11 +14,8 @@ def generate_assistant_id(prefix: str = "asst_", length: int = 24) -> str:
     - prefix: leading string (defaults to 'asst_')
     - length: number of random characters after the prefix
     """
-    # URL-safe characters similar to what OpenAI-style IDs use
-    alphabet = string.ascii_letters + string.digits  # a-zA-Z0-9
-
-    # cryptographically strong randomness
-    random_part = "".join(secrets.choice(alphabet) for _ in range(length))
+    # cryptographically strong randomness; hex keeps the ID within a-zA-Z0-9
+    random_part = secrets.token_hex(length // 2 + 1)[:length]
     return f"{prefix}{random_part}"
 
 
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import threading
+
 from src.backend.v4.integrations.google_sheets_reader import (
+    GoogleSheetsReader,
     find_value_in_table,
     find_values_for_rows_containing,
+    find_values_for_rows_containing_any,
 )
 
 
@@ -78,3 +82,43 @@ def test_find_values_for_rows_containing_returns_all_matches() -> None:
 
     assert [m.value for m in matches] == ["0.00", "1.23"]
     assert [m.a1_cell for m in matches] == ["B2", "B3"]
+
+
+def test_find_values_for_rows_containing_any_matches_each_substring() -> None:
+    rows = [
+        ["Account", "Nov. 2025"],
+        ["AR Clearing Account", "0.00"],
+        ["Petty Cash", "10.00"],
+        ["AP clearing account", "1.23"],
+    ]
+
+    matches = find_values_for_rows_containing_any(
+        rows=rows,
+        row_substrings=["clearing account", "petty cash", "undeposited"],
+        col_header="Nov. 2025",
+        header_row_index=0,
+    )
+
+    assert [m.a1_cell for m in matches["clearing account"]] == ["B2", "B4"]
+    assert [m.value for m in matches["petty cash"]] == ["10.00"]
+    assert matches["undeposited"] == []
+
+
+def test_service_cache_is_per_thread_and_clearable() -> None:
+    GoogleSheetsReader.clear_service_cache()
+    reader = GoogleSheetsReader(spreadsheet_id="sheet-1", service_account_path="/tmp/sa.json")
+    service = object()
+    GoogleSheetsReader._thread_service_cache()[("/tmp/sa.json", True)] = service
+
+    assert reader._build_sheets_service() is service
+
+    seen: list[dict] = []
+    worker = threading.Thread(
+        target=lambda: seen.append(dict(GoogleSheetsReader._thread_service_cache()))
+    )
+    worker.start()
+    worker.join()
+    assert seen == [{}]
+
+    GoogleSheetsReader.clear_service_cache()
+    assert GoogleSheetsReader._thread_service_cache() == {}
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Iterator
 from types import SimpleNamespace
 
 import pytest
@@ -18,22 +19,21 @@ class _FakeResp:
         return self._payload
 
 
-def test_get_company_info_refreshes_on_401(monkeypatch, tmp_path) -> None:
-    tokens_path = tmp_path / "tokens.json"
-    tokens_path.write_text(
-        json.dumps(
-            {
-                "environment": "sandbox",
-                "realm_id": "123",
-                "access_token": "expired",
-                "refresh_token": "refresh",
-                "id_token": None,
-                "saved_at_unix": 0,
-            }
-        )
-    )
+def _write_tokens(path, **overrides) -> None:
+    tokens = {
+        "environment": "sandbox",
+        "realm_id": "123",
+        "access_token": "ok",
+        "refresh_token": "refresh",
+        "id_token": None,
+        "expires_at_unix": 4102444800,
+    }
+    tokens.update(overrides)
+    path.write_text(json.dumps(tokens))
 
-    client = QBOClient(
+
+def _make_client(tokens_path) -> QBOClient:
+    return QBOClient(
         client_id="cid",
         client_secret="secret",
         redirect_uri="http://localhost",
@@ -41,6 +41,18 @@ def test_get_company_info_refreshes_on_401(monkeypatch, tmp_path) -> None:
         tokens_path=str(tokens_path),
     )
 
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory) -> Iterator[QBOClient]:
+    """One client over one valid tokens file; tests patch its session/refresh per test."""
+    tokens_path = tmp_path_factory.mktemp("qbo") / "tokens.json"
+    _write_tokens(tokens_path)
+    qbo = _make_client(tokens_path)
+    yield qbo
+    qbo.close()
+
+
+def test_get_company_info_refreshes_on_401(monkeypatch, client) -> None:
     calls = {"n": 0}
 
     def fake_request(method, url, headers=None, params=None, timeout=None):
@@ -49,7 +61,7 @@ def test_get_company_info_refreshes_on_401(monkeypatch, tmp_path) -> None:
             return _FakeResp(401, {"Fault": "invalid"}, text="invalid_token")
         return _FakeResp(200, {"CompanyInfo": {"CompanyName": "X", "Id": "1"}})
 
-    monkeypatch.setattr("requests.request", fake_request)
+    monkeypatch.setattr(client._session, "request", fake_request)
 
     def fake_refresh_tokens(tokens: QBOAuthTokens) -> QBOAuthTokens:
         return QBOAuthTokens(
@@ -67,62 +79,20 @@ def test_get_company_info_refreshes_on_401(monkeypatch, tmp_path) -> None:
     assert calls["n"] == 2
 
 
-def test_get_balance_sheet_passes_end_date(monkeypatch, tmp_path) -> None:
-    tokens_path = tmp_path / "tokens.json"
-    tokens_path.write_text(
-        json.dumps(
-            {
-                "environment": "sandbox",
-                "realm_id": "123",
-                "access_token": "ok",
-                "refresh_token": "refresh",
-                "id_token": None,
-            }
-        )
-    )
-
-    client = QBOClient(
-        client_id="cid",
-        client_secret="secret",
-        redirect_uri="http://localhost",
-        environment="sandbox",
-        tokens_path=str(tokens_path),
-    )
-
+def test_get_balance_sheet_passes_end_date(monkeypatch, client) -> None:
     seen = SimpleNamespace(params=None)
 
     def fake_request(method, url, headers=None, params=None, timeout=None):
         seen.params = params
         return _FakeResp(200, {"Rows": {"Row": []}})
 
-    monkeypatch.setattr("requests.request", fake_request)
+    monkeypatch.setattr(client._session, "request", fake_request)
 
     client.get_balance_sheet(end_date="2025-11-30")
     assert seen.params == {"end_date": "2025-11-30"}
 
 
-def test_get_accounts_uses_query_api(monkeypatch, tmp_path) -> None:
-    tokens_path = tmp_path / "tokens.json"
-    tokens_path.write_text(
-        json.dumps(
-            {
-                "environment": "sandbox",
-                "realm_id": "123",
-                "access_token": "ok",
-                "refresh_token": "refresh",
-                "id_token": None,
-            }
-        )
-    )
-
-    client = QBOClient(
-        client_id="cid",
-        client_secret="secret",
-        redirect_uri="http://localhost",
-        environment="sandbox",
-        tokens_path=str(tokens_path),
-    )
-
+def test_get_accounts_uses_query_api(monkeypatch, client) -> None:
     seen = SimpleNamespace(url=None, params=None)
 
     def fake_request(method, url, headers=None, params=None, timeout=None):
@@ -130,7 +100,7 @@ def test_get_accounts_uses_query_api(monkeypatch, tmp_path) -> None:
         seen.params = params
         return _FakeResp(200, {"QueryResponse": {"Account": []}})
 
-    monkeypatch.setattr("requests.request", fake_request)
+    monkeypatch.setattr(client._session, "request", fake_request)
 
     accounts = client.get_accounts(max_results=123)
     assert accounts == []
@@ -141,28 +111,7 @@ def test_get_accounts_uses_query_api(monkeypatch, tmp_path) -> None:
     assert "MAXRESULTS 123" in seen.params["query"]
 
 
-def test_get_aged_payables_detail_calls_report_endpoint(monkeypatch, tmp_path) -> None:
-    tokens_path = tmp_path / "tokens.json"
-    tokens_path.write_text(
-        json.dumps(
-            {
-                "environment": "sandbox",
-                "realm_id": "123",
-                "access_token": "ok",
-                "refresh_token": "refresh",
-                "id_token": None,
-            }
-        )
-    )
-
-    client = QBOClient(
-        client_id="cid",
-        client_secret="secret",
-        redirect_uri="http://localhost",
-        environment="sandbox",
-        tokens_path=str(tokens_path),
-    )
-
+def test_get_aged_payables_detail_calls_report_endpoint(monkeypatch, client) -> None:
     seen = SimpleNamespace(url=None, params=None)
 
     def fake_request(method, url, headers=None, params=None, timeout=None):
@@ -170,35 +119,14 @@ def test_get_aged_payables_detail_calls_report_endpoint(monkeypatch, tmp_path) -
         seen.params = params
         return _FakeResp(200, {"Rows": {"Row": []}})
 
-    monkeypatch.setattr("requests.request", fake_request)
+    monkeypatch.setattr(client._session, "request", fake_request)
 
     client.get_aged_payables_detail(end_date="2025-11-30")
     assert seen.url is not None and seen.url.endswith("/v3/company/123/reports/AgedPayablesDetail")
     assert seen.params == {"end_date": "2025-11-30"}
 
 
-def test_get_aged_receivables_detail_calls_report_endpoint(monkeypatch, tmp_path) -> None:
-    tokens_path = tmp_path / "tokens.json"
-    tokens_path.write_text(
-        json.dumps(
-            {
-                "environment": "sandbox",
-                "realm_id": "123",
-                "access_token": "ok",
-                "refresh_token": "refresh",
-                "id_token": None,
-            }
-        )
-    )
-
-    client = QBOClient(
-        client_id="cid",
-        client_secret="secret",
-        redirect_uri="http://localhost",
-        environment="sandbox",
-        tokens_path=str(tokens_path),
-    )
-
+def test_get_aged_receivables_detail_calls_report_endpoint(monkeypatch, client) -> None:
     seen = SimpleNamespace(url=None, params=None)
 
     def fake_request(method, url, headers=None, params=None, timeout=None):
@@ -206,10 +134,52 @@ def test_get_aged_receivables_detail_calls_report_endpoint(monkeypatch, tmp_path
         seen.params = params
         return _FakeResp(200, {"Rows": {"Row": []}})
 
-    monkeypatch.setattr("requests.request", fake_request)
+    monkeypatch.setattr(client._session, "request", fake_request)
 
     client.get_aged_receivables_detail(end_date="2025-11-30")
     assert seen.url is not None and seen.url.endswith(
         "/v3/company/123/reports/AgedReceivablesDetail"
     )
     assert seen.params == {"end_date": "2025-11-30"}
+
+
+def test_expired_tokens_refresh_before_request(monkeypatch, tmp_path) -> None:
+    tokens_path = tmp_path / "tokens.json"
+    _write_tokens(tokens_path, access_token="stale", expires_at_unix=0)
+    client = _make_client(tokens_path)
+
+    seen = SimpleNamespace(auth=[], refreshes=0)
+
+    def fake_request(method, url, headers=None, params=None, timeout=None):
+        seen.auth.append(headers["Authorization"])
+        return _FakeResp(200, {"CompanyInfo": {"CompanyName": "X", "Id": "1"}})
+
+    monkeypatch.setattr(client._session, "request", fake_request)
+
+    def fake_refresh_tokens(tokens: QBOAuthTokens) -> QBOAuthTokens:
+        seen.refreshes += 1
+        return QBOAuthTokens(
+            environment=tokens.environment,
+            realm_id=tokens.realm_id,
+            access_token="fresh",
+            refresh_token=tokens.refresh_token,
+        )
+
+    monkeypatch.setattr(client, "refresh_tokens", fake_refresh_tokens)
+
+    client.get_company_info()
+    assert seen.refreshes == 1
+    assert seen.auth == ["Bearer fresh"]
+
+
+def test_unexpired_tokens_skip_refresh(monkeypatch, client) -> None:
+    def fake_request(method, url, headers=None, params=None, timeout=None):
+        return _FakeResp(200, {"CompanyInfo": {"CompanyName": "X", "Id": "1"}})
+
+    def fail_refresh(tokens: QBOAuthTokens) -> QBOAuthTokens:
+        raise AssertionError("refresh should not be called")
+
+    monkeypatch.setattr(client._session, "request", fake_request)
+    monkeypatch.setattr(client, "refresh_tokens", fail_refresh)
+
+    assert client.get_company_info()["CompanyInfo"]["Id"] == "1"
@@ -13,6 +13,9 @@ from src.backend.common.models.messages_af import (
     AgentMessage,
     ActionRequest,
     HumanFeedback,
+    StartingTask,
+    TeamAgent,
+    TeamConfiguration,
 )
 
 
@@ -120,3 +123,18 @@ def test_step_defaults():
     )
     assert step.status == StepStatus.planned
     assert step.human_approval_status == HumanFeedbackStatus.requested
+
+
+def test_models_are_built_at_import():
+    """Schemas are built when the module loads, not lazily on first request."""
+    for model in (AgentMessage, Plan, Step, TeamConfiguration, PlanWithSteps):
+        assert model.__pydantic_complete__
+
+
+def test_team_agent_and_starting_task_keep_model_api():
+    agent = TeamAgent(input_key="k", type="t", name="Agent", icon="i")
+    task = StartingTask(
+        id="1", name="Task", prompt="p", created="", creator="", logo=""
+    )
+    assert agent.model_dump()["name"] == "Agent"
+    assert StartingTask.model_validate(task.model_dump()) == task
@@ -0,0 +1,94 @@
+# src/backend/tests/test_orchestration_config.py
+import asyncio
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+# Make repo root importable so `src.backend...` works
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+# Mock environment variables so app_config can construct safely at import time
+MOCK_ENV_VARS = {
+    "APPLICATIONINSIGHTS_CONNECTION_STRING": "InstrumentationKey=mock",
+    "AZURE_OPENAI_DEPLOYMENT_NAME": "mock-deployment",
+    "AZURE_OPENAI_RAI_DEPLOYMENT_NAME": "mock-rai-deployment",
+    "AZURE_OPENAI_API_VERSION": "2024-11-20",
+    "AZURE_OPENAI_ENDPOINT": "https://mock-openai-endpoint.azure.com/",
+    "AZURE_AI_SUBSCRIPTION_ID": "00000000-0000-0000-0000-000000000000",
+    "AZURE_AI_RESOURCE_GROUP": "rg-test",
+    "AZURE_AI_PROJECT_NAME": "proj-test",
+    "AZURE_AI_AGENT_ENDPOINT": "https://agents.example.com/",
+}
+
+with patch.dict(os.environ, MOCK_ENV_VARS, clear=False):
+    from src.backend.v4.config.settings import OrchestrationConfig
+
+
+def test_set_approval_result_without_pending_records_nothing():
+    config = OrchestrationConfig()
+    assert config.set_approval_result("plan-1", True) is False
+    assert "plan-1" not in config.approvals
+
+
+def test_approval_result_reaches_waiter_and_is_cleaned_up():
+    async def run():
+        config = OrchestrationConfig()
+        config.set_approval_pending("plan-1")
+        waiter = asyncio.create_task(config.wait_for_approval("plan-1", timeout=1))
+        await asyncio.sleep(0)
+        assert config.set_approval_result("plan-1", True) is True
+        assert await waiter is True
+        return config
+
+    config = asyncio.run(run())
+    assert "plan-1" not in config.approvals
+    assert "plan-1" not in config._approval_events
+
+
+def test_approval_decided_before_wait_is_cleaned_up():
+    async def run():
+        config = OrchestrationConfig()
+        config.set_approval_pending("plan-1")
+        assert config.set_approval_result("plan-1", False) is True
+        assert await config.wait_for_approval("plan-1", timeout=1) is False
+        return config
+
+    config = asyncio.run(run())
+    assert config.approvals == {}
+    assert config._approval_events == {}
+
+
+def test_approval_timeout_is_cleaned_up():
+    config = OrchestrationConfig()
+    config.set_approval_pending("plan-1")
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(config.wait_for_approval("plan-1", timeout=0.01))
+    assert config.approvals == {}
+    # A late answer for the abandoned plan is refused rather than stored.
+    assert config.set_approval_result("plan-1", True) is False
+    assert config.approvals == {}
+
+
+def test_set_clarification_result_without_pending_records_nothing():
+    config = OrchestrationConfig()
+    assert config.set_clarification_result("req-1", "answer") is False
+    assert "req-1" not in config.clarifications
+
+
+def test_clarification_answer_reaches_waiter_and_is_cleaned_up():
+    async def run():
+        config = OrchestrationConfig()
+        config.set_clarification_pending("req-1")
+        waiter = asyncio.create_task(config.wait_for_clarification("req-1", timeout=1))
+        await asyncio.sleep(0)
+        assert config.set_clarification_result("req-1", "use March") is True
+        assert await waiter == "use March"
+        return config
+
+    config = asyncio.run(run())
+    assert config.clarifications == {}
+    assert config._clarification_events == {}
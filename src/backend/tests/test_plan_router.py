@@ -0,0 +1,192 @@
+# src/backend/tests/test_plan_router.py
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+# Make repo root importable so `src.backend...` works
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+# Mock environment variables so app_config can construct safely at import time
+MOCK_ENV_VARS = {
+    "APPLICATIONINSIGHTS_CONNECTION_STRING": "InstrumentationKey=mock",
+    "AZURE_OPENAI_DEPLOYMENT_NAME": "mock-deployment",
+    "AZURE_OPENAI_RAI_DEPLOYMENT_NAME": "mock-rai-deployment",
+    "AZURE_OPENAI_API_VERSION": "2024-11-20",
+    "AZURE_OPENAI_ENDPOINT": "https://mock-openai-endpoint.azure.com/",
+    "AZURE_AI_SUBSCRIPTION_ID": "00000000-0000-0000-0000-000000000000",
+    "AZURE_AI_RESOURCE_GROUP": "rg-test",
+    "AZURE_AI_PROJECT_NAME": "proj-test",
+    "AZURE_AI_AGENT_ENDPOINT": "https://agents.example.com/",
+}
+
+with patch.dict(os.environ, MOCK_ENV_VARS, clear=False):
+    from src.backend.common.models.messages_af import InputTask, TeamConfiguration
+    from src.backend.v4.api import plan_router
+
+
+def _team(team_id="team-1"):
+    return TeamConfiguration(
+        team_id=team_id,
+        name="Test Team",
+        status="visible",
+        created="2024-01-01T00:00:00Z",
+        created_by="user-1",
+        user_id="user-1",
+    )
+
+
+def _memory_store(team_id="team-1", team=None):
+    store = SimpleNamespace()
+    store.get_current_team = AsyncMock(
+        return_value=SimpleNamespace(team_id=team_id) if team_id else None
+    )
+    store.get_team_by_id = AsyncMock(return_value=team)
+    return store
+
+
+@pytest.fixture(autouse=True)
+def _reset_plan_router_state():
+    plan_router.invalidate_team_cache()
+    yield
+    plan_router.invalidate_team_cache()
+
+
+def _resolve(store, user_id="user-1"):
+    with patch.object(
+        plan_router.DatabaseFactory, "get_database", AsyncMock(return_value=store)
+    ):
+        return asyncio.run(plan_router._resolve_team(user_id))
+
+
+def test_resolve_team_caches_team_and_returns_copies():
+    store = _memory_store(team=_team())
+
+    _, team_id, first = _resolve(store)
+    first.name = "Mutated by caller"
+    _, cached_id, second = _resolve(store)
+
+    assert team_id == cached_id == "team-1"
+    assert second.name == "Test Team"
+    store.get_current_team.assert_awaited_once()
+    store.get_team_by_id.assert_awaited_once()
+
+
+def test_invalidate_team_cache_forces_reload():
+    store = _memory_store(team=_team())
+
+    _resolve(store)
+    plan_router.invalidate_team_cache("user-1")
+    _resolve(store)
+
+    assert store.get_team_by_id.await_count == 2
+
+
+def test_invalidation_during_lookup_is_not_overwritten():
+    store = _memory_store(team=_team())
+
+    async def fetch_then_invalidate(team_id):
+        # The team changes (select_team / upload) while this lookup is awaiting.
+        plan_router.invalidate_team_cache("user-1")
+        return _team(team_id)
+
+    store.get_team_by_id = AsyncMock(side_effect=fetch_then_invalidate)
+
+    _, _, team = _resolve(store)
+
+    assert team.team_id == "team-1"
+    assert "user-1" not in plan_router._team_cache
+
+
+def test_resolve_team_without_selected_team_is_404():
+    with pytest.raises(HTTPException) as exc:
+        _resolve(_memory_store(team_id=None))
+    assert exc.value.status_code == 404
+
+
+def test_resolve_team_with_missing_team_is_404_and_not_cached():
+    store = _memory_store(team=None)
+    with pytest.raises(HTTPException) as exc:
+        _resolve(store)
+    assert exc.value.status_code == 404
+    assert "user-1" not in plan_router._team_cache
+
+
+def test_team_cache_evicts_expired_then_oldest_entries():
+    team = _team()
+    with patch.object(plan_router, "_TEAM_CACHE_MAXSIZE", 2):
+        plan_router._cache_team("expired", (0.0, "team-1", team))
+        plan_router._cache_team("oldest", (float("inf"), "team-1", team))
+        plan_router._cache_team("newer", (float("inf"), "team-1", team))
+        assert list(plan_router._team_cache) == ["oldest", "newer"]
+
+        plan_router._cache_team("newest", (float("inf"), "team-1", team))
+        assert list(plan_router._team_cache) == ["newer", "newest"]
+
+
+def test_full_orchestration_backlog_is_rejected_with_503():
+    with patch.object(plan_router, "_MAX_ORCHESTRATION_BACKLOG", 2), patch.object(
+        plan_router, "_orchestration_backlog", 0
+    ):
+        plan_router._reserve_orchestration_slot()
+        plan_router._reserve_orchestration_slot()
+        with pytest.raises(HTTPException) as exc:
+            plan_router._reserve_orchestration_slot()
+        assert exc.value.status_code == 503
+
+        plan_router._release_orchestration_slot()
+        plan_router._reserve_orchestration_slot()
+        assert plan_router._orchestration_backlog == 2
+
+
+def test_finished_orchestration_frees_its_slot():
+    manager = SimpleNamespace(run_orchestration=AsyncMock(return_value=None))
+
+    async def run():
+        plan_router._reserve_orchestration_slot()
+        task = plan_router._start_orchestration(
+            "user-1", InputTask(session_id="s-1", description="Close March")
+        )
+        await task
+        await asyncio.sleep(0)
+
+    with patch.object(plan_router, "_orchestration_backlog", 0), patch.object(
+        plan_router, "_orchestration_manager", lambda: manager
+    ):
+        asyncio.run(run())
+        assert plan_router._orchestration_backlog == 0
+    assert not plan_router._orchestration_tasks
+    manager.run_orchestration.assert_awaited_once()
+
+
+def test_cancel_orchestrations_cancels_and_drains_tasks():
+    started = []
+
+    async def never_finishes(user_id, input_task):
+        started.append(user_id)
+        await asyncio.Event().wait()
+
+    manager = SimpleNamespace(run_orchestration=never_finishes)
+
+    async def run():
+        for user_id in ("user-1", "user-2"):
+            plan_router._reserve_orchestration_slot()
+            plan_router._start_orchestration(
+                user_id, InputTask(session_id="s-1", description="Close March")
+            )
+        await asyncio.sleep(0)
+        await plan_router.cancel_orchestrations()
+
+    with patch.object(plan_router, "_orchestration_backlog", 0), patch.object(
+        plan_router, "_orchestration_manager", lambda: manager
+    ):
+        asyncio.run(run())
+        assert plan_router._orchestration_backlog == 0
+    assert started == ["user-1", "user-2"]
+    assert not plan_router._orchestration_tasks
@@ -13,6 +13,7 @@ from src.backend.v4.use_cases.mer_review_checks import (
     check_reconciled_zero_by_substring,
     check_zero_on_both_sides_by_substring,
     check_bank_balance_matches,
+    group_items_by_label_substrings,
 )
 
 
@@ -161,8 +162,38 @@ def test_check_zero_on_both_sides_by_substring_fails_when_mer_nonzero() -> None:
     assert res.passed is False
 
 
+def test_check_zero_on_both_sides_by_substring_folds_case_alike_on_both_sides() -> None:
+    # "ß" only matches "SS" under casefold, so a lower()-only side would miss it.
+    mer_lines = [("STRASSE Clearing", "5.00")]
+    qbo_items = [ReportLineItem(label="STRASSE Clearing", amount="5.00")]
+
+    res = check_zero_on_both_sides_by_substring(
+        check_id="UC-01",
+        mer_lines=mer_lines,
+        qbo_lines=qbo_items,
+        label_substring="Straße",
+        rule="Clearing should be zero on both MER and QBO",
+    )
+    assert res.details["mer_found"] is True
+    assert res.details["qbo_found"] is True
+    assert res.passed is False
+
+
 def test_check_bank_balance_matches() -> None:
     res = check_bank_balance_matches(
         mer_amount=Decimal("100.00"), qbo_amount=Decimal("100.01"), tolerance=Decimal("0.01")
     )
     assert res.passed is True
+
+
+def test_group_items_by_label_substrings_single_pass() -> None:
+    items = [
+        ReportLineItem(label="AR Clearing Account", amount="0.00"),
+        ReportLineItem(label="Undeposited Funds", amount="1.00"),
+        ReportLineItem(label="Cash", amount="5.00"),
+    ]
+    groups = group_items_by_label_substrings(items, ["Clearing", "undeposited", "", "clearing"])
+
+    assert set(groups) == {"clearing", "undeposited"}
+    assert [i.label for i in groups["clearing"]] == ["AR Clearing Account"]
+    assert [i.label for i in groups["undeposited"]] == ["Undeposited Funds"]
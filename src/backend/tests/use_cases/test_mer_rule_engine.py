@@ -1,16 +1,29 @@
 from __future__ import annotations
 
 from decimal import Decimal
+from typing import Any, Callable
+from unittest.mock import patch
+
+import pytest
 
 from src.backend.v4.integrations.qbo_reports import ReportLineItem
 from src.backend.v4.use_cases.mer_rule_engine import (
     MERBalanceSheetEvaluationContext,
     MERBalanceSheetRuleEngine,
+    _QBOReportCache,
     collect_action_items,
+    compile_rulebook,
 )
 
 
 class _StubQBO:
+    __slots__ = (
+        "_aged_payables_total",
+        "_aged_payables_detail",
+        "_aged_receivables_detail",
+        "_accounts",
+    )
+
     def __init__(
         self,
         *,
@@ -37,7 +50,27 @@ class _StubQBO:
         return self._accounts
 
 
-def test_engine_inventory_accounts_must_exist_in_qbo_and_mer() -> None:
+@pytest.fixture
+def make_ctx() -> Callable[..., MERBalanceSheetEvaluationContext]:
+    """Build an evaluation context for Nov. 2025 with zero tolerances; kwargs override."""
+
+    def _make(**overrides: Any) -> MERBalanceSheetEvaluationContext:
+        fields: dict[str, Any] = {
+            "end_date": "2025-11-30",
+            "mer_selected_month_header": "Nov. 2025",
+            "mer_header_row_index": 0,
+            "qbo_balance_sheet_items": [],
+            "qbo_client": _StubQBO(),
+            "zero_tolerance": Decimal("0.00"),
+            "amount_match_tolerance": Decimal("0.00"),
+        }
+        fields.update(overrides)
+        return MERBalanceSheetEvaluationContext(**fields)
+
+    return _make
+
+
+def test_engine_inventory_accounts_must_exist_in_qbo_and_mer(make_ctx) -> None:
     engine = MERBalanceSheetRuleEngine()
 
     rulebook = {
@@ -63,21 +96,15 @@ def test_engine_inventory_accounts_must_exist_in_qbo_and_mer() -> None:
         ["Amex", "50.00", ""],
     ]
 
-    ctx = MERBalanceSheetEvaluationContext(
-        end_date="2025-11-30",
+    ctx = make_ctx(
         mer_rows=mer_rows,
-        mer_selected_month_header="Nov. 2025",
-        mer_header_row_index=0,
         client_maintenance_rows=kyc_rows,
-        qbo_balance_sheet_items=[],
         qbo_client=_StubQBO(
             accounts=[
                 {"Name": "RBC Chequing"},
                 {"Name": "Amex"},
             ]
         ),
-        zero_tolerance=Decimal("0.00"),
-        amount_match_tolerance=Decimal("0.00"),
     )
 
     res = engine.evaluate(rulebook=rulebook, ctx=ctx)
@@ -88,22 +115,16 @@ def test_engine_inventory_accounts_must_exist_in_qbo_and_mer() -> None:
         ["Account", "Nov. 2025", "Comments"],
         ["RBC Chequing", "123.00", ""],
     ]
-    ctx2 = MERBalanceSheetEvaluationContext(
-        end_date="2025-11-30",
+    ctx2 = make_ctx(
         mer_rows=mer_rows_missing,
-        mer_selected_month_header="Nov. 2025",
-        mer_header_row_index=0,
         client_maintenance_rows=kyc_rows,
-        qbo_balance_sheet_items=[],
         qbo_client=_StubQBO(accounts=[{"Name": "RBC Chequing"}, {"Name": "Amex"}]),
-        zero_tolerance=Decimal("0.00"),
-        amount_match_tolerance=Decimal("0.00"),
     )
     res2 = engine.evaluate(rulebook=rulebook, ctx=ctx2)
     assert res2[0]["status"] == "failed"
 
 
-def test_engine_inventory_accounts_prefers_qbo_xero_name_column() -> None:
+def test_engine_inventory_accounts_prefers_qbo_xero_name_column(make_ctx) -> None:
     engine = MERBalanceSheetRuleEngine()
 
     rulebook = {
@@ -134,23 +155,17 @@ def test_engine_inventory_accounts_prefers_qbo_xero_name_column() -> None:
         ["RBC Chequing 6338", "123.00", ""],
     ]
 
-    ctx = MERBalanceSheetEvaluationContext(
-        end_date="2025-11-30",
+    ctx = make_ctx(
         mer_rows=mer_rows,
-        mer_selected_month_header="Nov. 2025",
-        mer_header_row_index=0,
         client_maintenance_rows=kyc_rows,
-        qbo_balance_sheet_items=[],
         qbo_client=_StubQBO(accounts=[{"Name": "RBC Chequing 6338"}]),
-        zero_tolerance=Decimal("0.00"),
-        amount_match_tolerance=Decimal("0.00"),
     )
 
     res = engine.evaluate(rulebook=rulebook, ctx=ctx)
     assert res[0]["status"] == "passed"
 
 
-def test_engine_qbo_aging_items_require_mer_comment_explanation_when_findings_exist() -> None:
+def test_engine_qbo_aging_items_require_mer_comment_explanation_when_findings_exist(make_ctx) -> None:
     engine = MERBalanceSheetRuleEngine()
 
     rulebook = {
@@ -214,15 +229,9 @@ def test_engine_qbo_aging_items_require_mer_comment_explanation_when_findings_ex
         ["Accounts Receivable", "200.00", ""],
     ]
 
-    ctx = MERBalanceSheetEvaluationContext(
-        end_date="2025-11-30",
+    ctx = make_ctx(
         mer_rows=rows,
-        mer_selected_month_header="Nov. 2025",
-        mer_header_row_index=0,
-        qbo_balance_sheet_items=[],
         qbo_client=_StubQBO(aged_payables_detail=ap_detail, aged_receivables_detail=ar_detail),
-        zero_tolerance=Decimal("0.00"),
-        amount_match_tolerance=Decimal("0.00"),
     )
 
     res = engine.evaluate(rulebook=rulebook, ctx=ctx)
@@ -234,22 +243,112 @@ def test_engine_qbo_aging_items_require_mer_comment_explanation_when_findings_ex
         ["Accounts Payable", "100.00", "Explained - waiting credit note"],
         ["Accounts Receivable", "200.00", "Explained - dispute in progress"],
     ]
-    ctx2 = MERBalanceSheetEvaluationContext(
-        end_date="2025-11-30",
+    ctx2 = make_ctx(
         mer_rows=rows_with_comments,
-        mer_selected_month_header="Nov. 2025",
-        mer_header_row_index=0,
-        qbo_balance_sheet_items=[],
         qbo_client=_StubQBO(aged_payables_detail=ap_detail, aged_receivables_detail=ar_detail),
-        zero_tolerance=Decimal("0.00"),
-        amount_match_tolerance=Decimal("0.00"),
     )
 
     res2 = engine.evaluate(rulebook=rulebook, ctx=ctx2)
     assert res2[0]["status"] == "passed"
 
 
-def test_engine_marks_unknown_eval_types_unimplemented() -> None:
+def test_engine_fetches_each_qbo_report_once_per_evaluation(make_ctx) -> None:
+    engine = MERBalanceSheetRuleEngine()
+
+    calls: list[str] = []
+
+    class _CountingQBO(_StubQBO):
+        def get_aged_payables_detail(self, *, end_date: str):
+            calls.append("ap")
+            return super().get_aged_payables_detail(end_date=end_date)
+
+        def get_aged_receivables_detail(self, *, end_date: str):
+            calls.append("ar")
+            return super().get_aged_receivables_detail(end_date=end_date)
+
+    rule = {
+        "title": "AP/AR items older than 60 days flagged",
+        "evaluation": {"type": "qbo_aging_items_older_than_threshold_require_explanation"},
+        "parameters": {"max_age_days": 60},
+    }
+    rulebook = {"rules": [{**rule, "rule_id": "AGING-1"}, {**rule, "rule_id": "AGING-2"}]}
+
+    ctx = make_ctx(
+        mer_rows=[["Account", "Nov. 2025", "Comments"]],
+        qbo_client=_CountingQBO(),
+    )
+
+    res = engine.evaluate(rulebook=rulebook, ctx=ctx)
+    assert [r["rule_id"] for r in res] == ["AGING-1", "AGING-2"]
+    assert calls == ["ap", "ar"]
+
+
+def test_qbo_report_cache_does_not_memoise_failures() -> None:
+    calls: list[str] = []
+
+    class _FlakyQBO(_StubQBO):
+        def get_aged_payables_detail(self, *, end_date: str):
+            calls.append(end_date)
+            if len(calls) == 1:
+                raise RuntimeError("HTTP 503: try again")
+            return {"ok": True}
+
+    qbo = _QBOReportCache(_FlakyQBO())
+
+    with pytest.raises(RuntimeError):
+        qbo.get_aged_payables_detail(end_date="2025-11-30")
+    assert qbo.get_aged_payables_detail(end_date="2025-11-30") == {"ok": True}
+    assert qbo.get_aged_payables_detail(end_date="2025-11-30") == {"ok": True}
+    assert calls == ["2025-11-30", "2025-11-30"]
+
+
+def test_qbo_report_cache_passes_unhashable_arguments_through() -> None:
+    calls: list[Any] = []
+
+    class _ListArgQBO(_StubQBO):
+        def get_accounts(self, *, types=None):
+            calls.append(types)
+            return [{"Name": "Cash"}]
+
+    qbo = _QBOReportCache(_ListArgQBO())
+
+    assert qbo.get_accounts(types=["Bank"]) == [{"Name": "Cash"}]
+    assert qbo.get_accounts(types=["Bank"]) == [{"Name": "Cash"}]
+    assert calls == [["Bank"], ["Bank"]]
+
+
+def test_engine_does_not_recompute_mer_columns_per_evaluation(make_ctx) -> None:
+    engine = MERBalanceSheetRuleEngine()
+    rulebook = {
+        "rules": [
+            {
+                "rule_id": "BS-CLEARING-ZERO",
+                "applies_to": {"qbo_balance_sheet_lines": {"label_contains_any": ["clearing"]}},
+                "evaluation": {"type": "balance_sheet_line_items_must_be_zero"},
+            }
+        ]
+    }
+    ctx = make_ctx(
+        mer_rows=[["Account", "Nov. 2025"], ["Etsy Clearing", "0.00"]],
+        qbo_balance_sheet_items=[ReportLineItem(label="Etsy Clearing", amount="0.00")],
+        qbo_client=_StubQBO(),
+    )
+
+    original = MERBalanceSheetEvaluationContext.__post_init__
+    calls: list[int] = []
+
+    def counting_post_init(self) -> None:
+        calls.append(1)
+        original(self)
+
+    with patch.object(MERBalanceSheetEvaluationContext, "__post_init__", counting_post_init):
+        res = engine.evaluate(rulebook=rulebook, ctx=ctx)
+
+    assert res[0]["status"] == "passed"
+    assert calls == []
+
+
+def test_engine_marks_unknown_eval_types_unimplemented(make_ctx) -> None:
     engine = MERBalanceSheetRuleEngine()
 
     rulebook = {
@@ -261,15 +360,9 @@ def test_engine_marks_unknown_eval_types_unimplemented() -> None:
         ]
     }
 
-    ctx = MERBalanceSheetEvaluationContext(
-        end_date="2025-11-30",
+    ctx = make_ctx(
         mer_rows=[["Account", "Nov. 2025"], ["Petty Cash", "10.00"]],
-        mer_selected_month_header="Nov. 2025",
-        mer_header_row_index=0,
         qbo_balance_sheet_items=[ReportLineItem(label="Petty Cash", amount="10.00")],
-        qbo_client=_StubQBO(),
-        zero_tolerance=Decimal("0.00"),
-        amount_match_tolerance=Decimal("0.00"),
     )
 
     res = engine.evaluate(rulebook=rulebook, ctx=ctx)
@@ -282,7 +375,7 @@ def test_engine_marks_unknown_eval_types_unimplemented() -> None:
     ]
 
 
-def test_engine_evaluates_balance_sheet_zero_rule() -> None:
+def test_engine_evaluates_balance_sheet_zero_rule(make_ctx) -> None:
     engine = MERBalanceSheetRuleEngine()
 
     rulebook = {
@@ -300,17 +393,11 @@ def test_engine_evaluates_balance_sheet_zero_rule() -> None:
 
     rows = [["Account", "Nov. 2025"], ["Undeposited Funds", "0.00"]]
 
-    ctx = MERBalanceSheetEvaluationContext(
-        end_date="2025-11-30",
+    ctx = make_ctx(
         mer_rows=rows,
-        mer_selected_month_header="Nov. 2025",
-        mer_header_row_index=0,
         qbo_balance_sheet_items=[
             ReportLineItem(label="Undeposited Funds", amount="0.00")
         ],
-        qbo_client=_StubQBO(),
-        zero_tolerance=Decimal("0.00"),
-        amount_match_tolerance=Decimal("0.00"),
     )
 
     res = engine.evaluate(rulebook=rulebook, ctx=ctx)
@@ -319,7 +406,65 @@ def test_engine_evaluates_balance_sheet_zero_rule() -> None:
     assert res[0]["status"] == "passed"
 
 
-def test_engine_evaluates_mer_line_amount_matches_qbo_line_amount() -> None:
+def test_engine_zero_rule_fails_on_mer_balance_without_qbo_line(make_ctx) -> None:
+    engine = MERBalanceSheetRuleEngine()
+
+    rulebook = {
+        "rules": [
+            {
+                "rule_id": "BS-UNDEPOSITED-FUNDS-ZERO",
+                "applies_to": {
+                    "qbo_balance_sheet_lines": {"label_contains_any": ["undeposited"]}
+                },
+                "evaluation": {"type": "balance_sheet_line_items_must_be_zero"},
+            }
+        ]
+    }
+
+    ctx = make_ctx(
+        mer_rows=[["Account", "Nov. 2025"], ["Undeposited Funds", "25.00"]],
+        qbo_balance_sheet_items=[ReportLineItem(label="Petty Cash", amount="10.00")],
+    )
+
+    res = engine.evaluate(rulebook=rulebook, ctx=ctx)
+    assert res[0]["status"] == "failed"
+    assert res[0]["details"]["mer_found"] is True
+    assert res[0]["details"]["qbo_found"] is False
+
+
+def test_engine_accepts_precompiled_rulebook(make_ctx) -> None:
+    engine = MERBalanceSheetRuleEngine()
+
+    rulebook = {
+        "rules": [
+            {
+                "rule_id": "BS-UNDEPOSITED-FUNDS-ZERO",
+                "applies_to": {
+                    "qbo_balance_sheet_lines": {"label_contains_any": ["undeposited"]}
+                },
+                "evaluation": {"type": "balance_sheet_line_items_must_be_zero"},
+            },
+            {"rule_id": "OFF", "enabled": False, "evaluation": {"type": "manual_process_required"}},
+            "not-a-rule",
+        ]
+    }
+
+    compiled = compile_rulebook(rulebook)
+    assert [c.rule_id for c in compiled] == ["BS-UNDEPOSITED-FUNDS-ZERO", "OFF"]
+    assert compiled[0].label_substring == "undeposited"
+    assert compiled[1].enabled is False
+
+    ctx = make_ctx(
+        mer_rows=[["Account", "Nov. 2025"], ["Undeposited Funds", "0.00"]],
+        qbo_balance_sheet_items=[ReportLineItem(label="Undeposited Funds", amount="0.00")],
+    )
+
+    assert engine.evaluate(rulebook=rulebook, ctx=ctx, compiled=compiled) == engine.evaluate(
+        rulebook=rulebook, ctx=ctx
+    )
+
+
+def test_engine_evaluates_mer_line_amount_matches_qbo_line_amount(make_ctx) -> None:
     engine = MERBalanceSheetRuleEngine()
 
     rulebook = {
@@ -337,15 +482,9 @@ def test_engine_evaluates_mer_line_amount_matches_qbo_line_amount() -> None:
 
     rows = [["Account", "Nov. 2025"], ["Petty Cash", "10.00"]]
 
-    ctx = MERBalanceSheetEvaluationContext(
-        end_date="2025-11-30",
+    ctx = make_ctx(
         mer_rows=rows,
-        mer_selected_month_header="Nov. 2025",
-        mer_header_row_index=0,
         qbo_balance_sheet_items=[ReportLineItem(label="Petty Cash", amount="10.00")],
-        qbo_client=_StubQBO(),
-        zero_tolerance=Decimal("0.00"),
-        amount_match_tolerance=Decimal("0.00"),
     )
 
     res = engine.evaluate(rulebook=rulebook, ctx=ctx)
@@ -354,7 +493,7 @@ def test_engine_evaluates_mer_line_amount_matches_qbo_line_amount() -> None:
     assert res[0]["details"]["qbo_first_match_raw"] == "10.00"
 
 
-def test_engine_evaluates_qbo_report_total_matches_balance_sheet_line_ap() -> None:
+def test_engine_evaluates_qbo_report_total_matches_balance_sheet_line_ap(make_ctx) -> None:
     engine = MERBalanceSheetRuleEngine()
 
     rulebook = {
@@ -375,17 +514,12 @@ def test_engine_evaluates_qbo_report_total_matches_balance_sheet_line_ap() -> No
         "Rows": {"Row": [{"ColData": [{"value": "TOTAL"}, {"value": "100.00"}]}]},
     }
 
-    ctx = MERBalanceSheetEvaluationContext(
-        end_date="2025-11-30",
+    ctx = make_ctx(
         mer_rows=[["Account", "Nov. 2025"]],
-        mer_selected_month_header="Nov. 2025",
-        mer_header_row_index=0,
         qbo_balance_sheet_items=[
             ReportLineItem(label="Accounts Payable", amount="100.00")
         ],
         qbo_client=_StubQBO(aged_payables_total=aged_payables_total),
-        zero_tolerance=Decimal("0.00"),
-        amount_match_tolerance=Decimal("0.00"),
     )
 
     res = engine.evaluate(rulebook=rulebook, ctx=ctx)
@@ -416,7 +550,7 @@ def test_collect_action_items_includes_manual_sop_and_process_actions() -> None:
     ]
 
 
-def test_engine_returns_needs_human_review_for_requires_external_reconciliation_verification() -> None:
+def test_engine_returns_needs_human_review_for_requires_external_reconciliation_verification(make_ctx) -> None:
     engine = MERBalanceSheetRuleEngine()
 
     rulebook = {
@@ -430,15 +564,8 @@ def test_engine_returns_needs_human_review_for_requires_external_reconciliation_
         ]
     }
 
-    ctx = MERBalanceSheetEvaluationContext(
-        end_date="2025-11-30",
+    ctx = make_ctx(
         mer_rows=[["Account", "Nov. 2025"]],
-        mer_selected_month_header="Nov. 2025",
-        mer_header_row_index=0,
-        qbo_balance_sheet_items=[],
-        qbo_client=_StubQBO(),
-        zero_tolerance=Decimal("0.00"),
-        amount_match_tolerance=Decimal("0.00"),
     )
 
     res = engine.evaluate(rulebook=rulebook, ctx=ctx)
@@ -448,7 +575,7 @@ def test_engine_returns_needs_human_review_for_requires_external_reconciliation_
     assert res[0]["details"]["required_sources"] == ["reconciliation_spreadsheet"]
 
 
-def test_engine_returns_needs_human_review_for_manual_process_required() -> None:
+def test_engine_returns_needs_human_review_for_manual_process_required(make_ctx) -> None:
     engine = MERBalanceSheetRuleEngine()
 
     rulebook = {
@@ -463,15 +590,8 @@ def test_engine_returns_needs_human_review_for_manual_process_required() -> None
         ]
     }
 
-    ctx = MERBalanceSheetEvaluationContext(
-        end_date="2025-11-30",
+    ctx = make_ctx(
         mer_rows=[["Account", "Nov. 2025"]],
-        mer_selected_month_header="Nov. 2025",
-        mer_header_row_index=0,
-        qbo_balance_sheet_items=[],
-        qbo_client=_StubQBO(),
-        zero_tolerance=Decimal("0.00"),
-        amount_match_tolerance=Decimal("0.00"),
     )
 
     res = engine.evaluate(rulebook=rulebook, ctx=ctx)
@@ -481,7 +601,7 @@ def test_engine_returns_needs_human_review_for_manual_process_required() -> None
     assert "raise_obp_ticket" in res[0]["details"]["action_items"]
 
 
-def test_engine_mer_lines_require_link_to_support_checks_comments_column() -> None:
+def test_engine_mer_lines_require_link_to_support_checks_comments_column(make_ctx) -> None:
     engine = MERBalanceSheetRuleEngine()
 
     rulebook = {
@@ -500,15 +620,8 @@ def test_engine_mer_lines_require_link_to_support_checks_comments_column() -> No
         ["Equipment", "100.00", ""],
     ]
 
-    ctx = MERBalanceSheetEvaluationContext(
-        end_date="2025-11-30",
+    ctx = make_ctx(
         mer_rows=rows,
-        mer_selected_month_header="Nov. 2025",
-        mer_header_row_index=0,
-        qbo_balance_sheet_items=[],
-        qbo_client=_StubQBO(),
-        zero_tolerance=Decimal("0.00"),
-        amount_match_tolerance=Decimal("0.00"),
     )
 
     res = engine.evaluate(rulebook=rulebook, ctx=ctx)
@@ -518,7 +631,7 @@ def test_engine_mer_lines_require_link_to_support_checks_comments_column() -> No
     assert res[0]["details"]["missing_support"][0]["comments_a1_cell"] == "C2"
 
 
-def test_engine_support_link_presence_check_loan_rows_only() -> None:
+def test_engine_support_link_presence_check_loan_rows_only(make_ctx) -> None:
     engine = MERBalanceSheetRuleEngine()
 
     rulebook = {
@@ -538,15 +651,8 @@ def test_engine_support_link_presence_check_loan_rows_only() -> None:
         ["Loan Payable", "1000.00", ""],
     ]
 
-    ctx = MERBalanceSheetEvaluationContext(
-        end_date="2025-11-30",
+    ctx = make_ctx(
         mer_rows=rows,
-        mer_selected_month_header="Nov. 2025",
-        mer_header_row_index=0,
-        qbo_balance_sheet_items=[],
-        qbo_client=_StubQBO(),
-        zero_tolerance=Decimal("0.00"),
-        amount_match_tolerance=Decimal("0.00"),
     )
 
     res = engine.evaluate(rulebook=rulebook, ctx=ctx)
@@ -557,7 +663,7 @@ def test_engine_support_link_presence_check_loan_rows_only() -> None:
     assert res[0]["details"]["missing_support"][0]["comments_a1_cell"] == "C3"
 
 
-def test_engine_support_link_presence_check_requires_external_sources_returns_needs_human_review() -> None:
+def test_engine_support_link_presence_check_requires_external_sources_returns_needs_human_review(make_ctx) -> None:
     engine = MERBalanceSheetRuleEngine()
 
     rulebook = {
@@ -572,15 +678,8 @@ def test_engine_support_link_presence_check_requires_external_sources_returns_ne
     }
 
     rows = [["Account", "Nov. 2025", "Comments"], ["Petty Cash", "10.00", ""]]
-    ctx = MERBalanceSheetEvaluationContext(
-        end_date="2025-11-30",
+    ctx = make_ctx(
         mer_rows=rows,
-        mer_selected_month_header="Nov. 2025",
-        mer_header_row_index=0,
-        qbo_balance_sheet_items=[],
-        qbo_client=_StubQBO(),
-        zero_tolerance=Decimal("0.00"),
-        amount_match_tolerance=Decimal("0.00"),
     )
 
     res = engine.evaluate(rulebook=rulebook, ctx=ctx)
@@ -4,10 +4,13 @@ This module handles all MER (Month-End Review) related endpoints,
 including balance sheet review checks driven by the YAML rulebook.
 """
 
+import asyncio
 import logging
 import os
+import re
 from datetime import date as _date
 from decimal import Decimal
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Any
 
@@ -19,16 +22,28 @@ from src.backend.v4.integrations.google_sheets_reader import GoogleSheetsReader
 from src.backend.v4.integrations.qbo_client import QBOClient
 from src.backend.v4.integrations.qbo_reports import extract_balance_sheet_items
 from src.backend.v4.use_cases.mer_rule_engine import (
+    CompiledRule,
     MERBalanceSheetEvaluationContext,
     MERBalanceSheetRuleEngine,
     collect_action_items,
+    compile_rulebook,
 )
 from src.backend.v4.use_cases.mer_review_checks import pick_latest_month_header
 
+try:
+    # libyaml-backed loader; PyYAML wheels ship it, source builds may not.
+    from yaml import CSafeLoader as _YamlSafeLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader as _YamlSafeLoader
+
 logger = logging.getLogger(__name__)
 
 mer_router = APIRouter(tags=["MER Review"])
 
+# The engine keeps no per-evaluation state (the context is passed to evaluate),
+# so one instance serves every request.
+_ENGINE = MERBalanceSheetRuleEngine()
+
 
 # ---------------------------------------------------------------------------
 # Request/Response Models
@@ -65,32 +80,87 @@ def _repo_root_from_this_file() -> Path:
     return Path(__file__).resolve().parents[4]
 
 
-def _load_rulebook_yaml(path: Path) -> dict[str, Any]:
-    """Load and parse the MER rulebook YAML file."""
+# Resolved once at import; the file does not move while the app runs.
+_REPO_ROOT = _repo_root_from_this_file()
+_DEFAULT_RULEBOOK = _REPO_ROOT / "data" / "mer_rulebooks" / "balance_sheet_review_points.yaml"
+
+_ISO_DATE_RE = re.compile(r"\A\d{4}-\d{2}-\d{2}\Z")
+
+
+@lru_cache(maxsize=8)
+def _parse_rulebook_yaml(
+    path: Path, mtime_ns: int, size: int
+) -> tuple[dict[str, Any], tuple[CompiledRule, ...]]:
+    """Parse and compile a rulebook file; cached per file version (mtime/size are part of the key)."""
+    with open(path, "r", encoding="utf-8") as f:
+        rulebook = yaml.load(f, Loader=_YamlSafeLoader) or {}
+    return rulebook, compile_rulebook(rulebook)
+
+
+@lru_cache(maxsize=8)
+def _rulebook_action_items(
+    path: Path, mtime_ns: int, size: int, limit_env: str | None
+) -> list[dict[str, Any]]:
+    """Action items for a rulebook file version; the limit env value is part of the key."""
+    rulebook, _ = _parse_rulebook_yaml(path, mtime_ns, size)
+    return collect_action_items(rulebook)
+
+
+def _load_rulebook_yaml(
+    path: Path,
+) -> tuple[dict[str, Any], tuple[CompiledRule, ...], list[dict[str, Any]]]:
+    """Load and parse the MER rulebook YAML file, with its compiled rules and action items.
+
+    The parsed rulebook and action items are shared between requests until
+    the file changes, so callers must treat them as read-only.
+    """
     if not path.exists():
         raise HTTPException(
             status_code=400,
             detail=f"Rulebook file not found: {path}",
         )
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f) or {}
+        st = path.stat()
+        rulebook, compiled = _parse_rulebook_yaml(path, st.st_mtime_ns, st.st_size)
+        action_items = _rulebook_action_items(
+            path,
+            st.st_mtime_ns,
+            st.st_size,
+            os.environ.get("MER_AGENT_ACTION_ITEMS_LIMIT"),
+        )
+        return rulebook, compiled, action_items
     except Exception as e:
-        logger.error(f"Failed to load rulebook {path}: {e}")
+        logger.error("Failed to load rulebook %s: %s", path, e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to parse rulebook YAML: {e}",
         )
 
 
+_ZERO_AMOUNT = Decimal("0.00")
+
+
 def _decimal_from_rulebook_amount(amount_str: str | None) -> Decimal:
     """Parse a decimal amount from rulebook config (e.g., '0.00', '100.00')."""
     if not amount_str:
-        return Decimal("0.00")
+        return _ZERO_AMOUNT
+    # YAML may hand back numbers; Decimal() already ignores surrounding whitespace.
+    text = amount_str if isinstance(amount_str, str) else str(amount_str)
+    if "," in text:
+        text = text.replace(",", "")
     try:
-        return Decimal(str(amount_str).replace(",", "").strip())
+        return Decimal(text)
     except Exception:
-        return Decimal("0.00")
+        return _ZERO_AMOUNT
+
+
+@lru_cache(maxsize=1)
+def _qbo_client() -> QBOClient:
+    """Process-wide QBO client, so requests share its pooled HTTP session.
+
+    QBOClient serialises token refreshes internally, so it is safe to share.
+    """
+    return QBOClient.from_env()
 
 
 # ---------------------------------------------------------------------------
@@ -108,26 +178,28 @@ async def mer_review_balance_sheet(body: MERBalanceSheetReviewRequest):
     - Returns a structured JSON payload (does not edit MER)
     """
 
-    # Validate end_date format early (YYYY-MM-DD)
-    try:
-        _date.fromisoformat(body.end_date)
-    except Exception:
+    # Validate end_date format early (YYYY-MM-DD); the regex rejects malformed
+    # input cheaply, fromisoformat still catches impossible dates (2025-13-40).
+    valid_end_date = _ISO_DATE_RE.match(body.end_date) is not None
+    if valid_end_date:
+        try:
+            _date.fromisoformat(body.end_date)
+        except ValueError:
+            valid_end_date = False
+    if not valid_end_date:
         raise HTTPException(
             status_code=400,
             detail="end_date must be an ISO date (YYYY-MM-DD)",
         )
 
-    repo_root = _repo_root_from_this_file()
-    default_rulebook = (
-        repo_root / "data" / "mer_rulebooks" / "balance_sheet_review_points.yaml"
-    )
-    rulebook_path = Path(body.rulebook_path) if body.rulebook_path else default_rulebook
+    rulebook_path = Path(body.rulebook_path) if body.rulebook_path else _DEFAULT_RULEBOOK
     if not rulebook_path.is_absolute():
-        rulebook_path = (repo_root / rulebook_path).resolve()
+        rulebook_path = (_REPO_ROOT / rulebook_path).resolve()
 
-    rulebook = _load_rulebook_yaml(rulebook_path)
+    rulebook, compiled_rules, action_items = _load_rulebook_yaml(rulebook_path)
 
-    policies = (rulebook.get("rulebook") or {}).get("policies") or {}
+    rulebook_meta = rulebook.get("rulebook") or {}
+    policies = rulebook_meta.get("policies") or {}
     tolerances = policies.get("tolerances") or {}
     zero_amount = (tolerances.get("zero_balance") or {}).get("amount")
     zero_tolerance = _decimal_from_rulebook_amount(zero_amount)
@@ -151,27 +223,24 @@ async def mer_review_balance_sheet(body: MERBalanceSheetReviewRequest):
             )
 
     mer_range = body.mer_range or f"'{sheet}'!A1:Z1000"
-    rows = reader.fetch_rows(a1_range=mer_range)
-    if not rows:
-        raise HTTPException(status_code=400, detail="No rows returned from Google Sheets")
 
-    # Optional: Fetch Client Maintenance / KYC rows (used by inventory-based rules)
-    client_maintenance_rows: list[list[str]] | None = None
+    # Optional: Client Maintenance / KYC rows (used by inventory-based rules)
     # Prefer explicit caller value, then environment override, then a provided default
     cm_spreadsheet_id = (
         body.client_maintenance_spreadsheet_id
         or os.environ.get("CLIENT_MAINTENANCE_SPREADSHEET_ID")
         or "1WdGczVyMQ-ywEJHX_A1OeUzobuqyZV4seeEwlnRYkIQ"
     )
+    cm_fetch = None
     if cm_spreadsheet_id:
         cm_reader = GoogleSheetsReader.from_env_with_spreadsheet_id(cm_spreadsheet_id)
         # Default to the client's maintenance tab requested by the user
         cm_sheet = body.client_maintenance_sheet or "Account reconciliation list"
         cm_range = body.client_maintenance_range or f"'{cm_sheet}'!A1:Z1000"
-        client_maintenance_rows = cm_reader.fetch_rows(a1_range=cm_range)
+        cm_fetch = partial(cm_reader.fetch_rows, a1_range=cm_range)
 
-    # Optional: Fetch separate KYC rows (often a different spreadsheet than Client Maintenance)
-    kyc_rows: list[list[str]] | None = None
+    # Optional: separate KYC rows (often a different spreadsheet than Client Maintenance)
+    kyc_fetch = None
     if body.kyc_spreadsheet_id:
         kyc_reader = GoogleSheetsReader.from_env_with_spreadsheet_id(body.kyc_spreadsheet_id)
         kyc_sheet = body.kyc_sheet
@@ -183,7 +252,20 @@ async def mer_review_balance_sheet(body: MERBalanceSheetReviewRequest):
                     detail="kyc_range is required when kyc_sheet is not provided",
                 )
             kyc_range = f"'{kyc_sheet}'!A1:Z2000"
-        kyc_rows = kyc_reader.fetch_rows(a1_range=kyc_range)
+        kyc_fetch = partial(kyc_reader.fetch_rows, a1_range=kyc_range)
+
+    # The Sheets reads are independent round-trips; run them together. QBO is
+    # only called once the MER rows have passed the header checks below.
+    async def _run_optional(fetch):
+        return await asyncio.to_thread(fetch) if fetch is not None else None
+
+    rows, client_maintenance_rows, kyc_rows = await asyncio.gather(
+        asyncio.to_thread(reader.fetch_rows, a1_range=mer_range),
+        _run_optional(cm_fetch),
+        _run_optional(kyc_fetch),
+    )
+    if not rows:
+        raise HTTPException(status_code=400, detail="No rows returned from Google Sheets")
 
     # Identify the month header to use
     header_row_index: int | None = None
@@ -209,9 +291,9 @@ async def mer_review_balance_sheet(body: MERBalanceSheetReviewRequest):
         if header_row_index is None:
             raise HTTPException(status_code=400, detail="Could not detect header row")
 
-    # Fetch QBO Balance Sheet items
-    qbo = QBOClient.from_env()
-    report = qbo.get_balance_sheet(
+    qbo = _qbo_client()
+    report = await asyncio.to_thread(
+        qbo.get_balance_sheet,
         end_date=body.end_date,
         start_date=body.end_date,
         accounting_method=None,
@@ -219,7 +301,6 @@ async def mer_review_balance_sheet(body: MERBalanceSheetReviewRequest):
     )
     qbo_items = extract_balance_sheet_items(report)
 
-    engine = MERBalanceSheetRuleEngine()
     ctx = MERBalanceSheetEvaluationContext(
         end_date=body.end_date,
         mer_rows=rows,
@@ -234,16 +315,18 @@ async def mer_review_balance_sheet(body: MERBalanceSheetReviewRequest):
         mer_bank_row_key=body.mer_bank_row_key,
         qbo_bank_label_substring=body.qbo_bank_label_substring,
     )
-    results = engine.evaluate(rulebook=rulebook, ctx=ctx)
+    results = _ENGINE.evaluate(rulebook=rulebook, ctx=ctx, compiled=compiled_rules)
 
     logger.info(
-        f"MER review completed: {len(results)} rules evaluated for period {body.end_date}"
+        "MER review completed: %s rules evaluated for period %s",
+        len(results),
+        body.end_date,
     )
 
     return {
         "rulebook": {
-            "id": (rulebook.get("rulebook") or {}).get("id"),
-            "version": (rulebook.get("rulebook") or {}).get("version"),
+            "id": rulebook_meta.get("id"),
+            "version": rulebook_meta.get("version"),
             "path": str(rulebook_path),
         },
         "period_end_date": body.end_date,
@@ -261,12 +344,10 @@ async def mer_review_balance_sheet(body: MERBalanceSheetReviewRequest):
             "zero_tolerance": str(zero_tolerance),
             "amount_match_tolerance": str(amount_match_tolerance),
             "amount_match_requires_clarification": bool(
-                (tolerances.get("amount_match") or {}).get("requires_clarification")
+                amount_match_cfg.get("requires_clarification")
             ),
         },
-        "requires_clarification": (rulebook.get("rulebook") or {}).get(
-            "requires_clarification", []
-        ),
-        "action_items": collect_action_items(rulebook),
+        "requires_clarification": rulebook_meta.get("requires_clarification", []),
+        "action_items": action_items,
         "results": results,
     }
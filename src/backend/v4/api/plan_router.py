@@ -10,15 +10,24 @@ This module handles all plan-related endpoints, including:
 
 import asyncio
 import logging
+import os
+import time
 import uuid
+from functools import lru_cache
 from typing import Optional
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from pydantic import BaseModel
 
 from src.backend.auth.auth_utils import get_authenticated_user_details
+from src.backend.common.database.database_base import DatabaseBase
 from src.backend.common.database.database_factory import DatabaseFactory
-from src.backend.common.models.messages_af import InputTask, Plan, PlanStatus
+from src.backend.common.models.messages_af import (
+    InputTask,
+    Plan,
+    PlanStatus,
+    TeamConfiguration,
+)
 from src.backend.common.utils.event_utils import track_event_if_configured
 from src.backend.common.utils.utils_af import rai_success
 from src.backend.v4.common.services.plan_service import PlanService
@@ -32,6 +41,205 @@ logger = logging.getLogger(__name__)
 plan_router = APIRouter(tags=["Plans"])
 
 
+async def get_current_user_id(request: Request) -> str:
+    """Resolve the authenticated user id once per request (FastAPI dependency).
+
+    The id is memoized on ``request.state`` so other dependencies of the same
+    request reuse it instead of re-parsing the auth headers.
+    """
+    user_id = getattr(request.state, "user_id", None)
+    if user_id is None:
+        authenticated_user = get_authenticated_user_details(
+            request_headers=request.headers
+        )
+        user_id = authenticated_user["user_principal_id"]
+        request.state.user_id = user_id
+    if not user_id:
+        track_event_if_configured(
+            "UserIdNotFound", {"status_code": 401, "detail": "no user"}
+        )
+        raise HTTPException(
+            status_code=401, detail="Missing or invalid user information"
+        )
+    return user_id
+
+
+async def get_memory_store(
+    request: Request, user_id: str = Depends(get_current_user_id)
+) -> DatabaseBase:
+    """Resolve the database for the current user once per request (FastAPI dependency)."""
+    memory_store = getattr(request.state, "memory_store", None)
+    if memory_store is None:
+        memory_store = await DatabaseFactory.get_database(user_id=user_id)
+        request.state.memory_store = memory_store
+    return memory_store
+
+
+# Per-user team resolution: user_id -> (expires_at, team_id, team). Entries
+# are short-lived and dropped by the team endpoints whenever the selection or
+# a team configuration changes. The cache is per process, so invalidation only
+# reaches the replica that served the change: it assumes a single replica (or
+# sticky sessions). Multi-replica deployments should set
+# TEAM_CACHE_TTL_SECONDS=0 to disable it.
+_TEAM_CACHE_TTL_SECONDS = max(float(os.environ.get("TEAM_CACHE_TTL_SECONDS", "30")), 0.0)
+# Bound on cached users; past it, expired entries go first, then the oldest.
+_TEAM_CACHE_MAXSIZE = 10000
+_team_cache: dict[str, tuple[float, str, TeamConfiguration]] = {}
+# Bumped by every invalidation; a lookup that started before a bump must not
+# store what it read, as the team may have changed while it was awaiting.
+_team_cache_generation = 0
+
+
+def _cache_team(user_id: str, entry: tuple[float, str, TeamConfiguration]) -> None:
+    """Store a user's team, evicting expired then least recently stored entries."""
+    _team_cache.pop(user_id, None)  # re-insert so dict order tracks store time
+    _team_cache[user_id] = entry
+    if len(_team_cache) <= _TEAM_CACHE_MAXSIZE:
+        return
+    now = time.monotonic()
+    for expired in [uid for uid, cached in _team_cache.items() if cached[0] <= now]:
+        del _team_cache[expired]
+    while len(_team_cache) > _TEAM_CACHE_MAXSIZE:
+        del _team_cache[next(iter(_team_cache))]
+
+
+def invalidate_team_cache(user_id: Optional[str] = None) -> None:
+    """Forget the cached team for one user, or for everyone when no id is given."""
+    global _team_cache_generation
+    _team_cache_generation += 1
+    if user_id is None:
+        _team_cache.clear()
+    else:
+        _team_cache.pop(user_id, None)
+
+
+async def _resolve_team(user_id: str):
+    """Return (memory_store, team_id, team) for the user's current team.
+
+    Raises HTTPException(404) when no team is selected or it no longer exists.
+    Each call gets its own copy of the team, as it did when every request read
+    it from the database.
+    """
+    # DatabaseFactory returns the process-wide client; no round trip once warm.
+    memory_store = await DatabaseFactory.get_database(user_id=user_id)
+    now = time.monotonic()
+    cached = _team_cache.get(user_id)
+    if cached is not None and cached[0] > now:
+        return memory_store, cached[1], cached[2].model_copy(deep=True)
+
+    generation = _team_cache_generation
+    user_current_team = await memory_store.get_current_team(user_id=user_id)
+    team_id = None
+    if user_current_team:
+        team_id = user_current_team.team_id
+    if not team_id:
+        raise HTTPException(
+            status_code=404,
+            detail="No team selected. Please select a team first.",
+        )
+    team = await memory_store.get_team_by_id(team_id=team_id)
+    if not team:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Team configuration '{team_id}' not found or access denied",
+        )
+    if _TEAM_CACHE_TTL_SECONDS > 0 and generation == _team_cache_generation:
+        _cache_team(
+            user_id,
+            (now + _TEAM_CACHE_TTL_SECONDS, team_id, team.model_copy(deep=True)),
+        )
+    return memory_store, team_id, team
+
+
+@lru_cache(maxsize=1)
+def _orchestration_manager() -> OrchestrationManager:
+    """Shared manager; it keeps no per-run state (workflows live in orchestration_config)."""
+    return OrchestrationManager()
+
+
+def _ws_error(content: str) -> dict:
+    """WebSocket ERROR_MESSAGE payload, stamped with the running event loop's clock.
+
+    Must be called from a coroutine.
+    """
+    return {
+        "type": WebsocketMessageType.ERROR_MESSAGE,
+        "data": {
+            "content": content,
+            "status": "error",
+            "timestamp": asyncio.get_running_loop().time(),
+        },
+    }
+
+
+# Orchestrations hold LLM sessions and DB connections for their whole run, so
+# cap how many run at once; accepted requests beyond the cap wait for a free
+# slot. The backlog (running plus waiting) is bounded too: past it,
+# process_request answers 503 instead of queueing more work.
+_MAX_CONCURRENT_ORCHESTRATIONS = max(
+    int(os.environ.get("MAX_CONCURRENT_ORCHESTRATIONS", "8")), 1
+)
+_MAX_ORCHESTRATION_BACKLOG = max(
+    int(os.environ.get("MAX_ORCHESTRATION_BACKLOG", "32")),
+    _MAX_CONCURRENT_ORCHESTRATIONS,
+)
+_orchestration_sem = asyncio.Semaphore(_MAX_CONCURRENT_ORCHESTRATIONS)
+# Slots claimed by accepted requests, from reservation until their task ends.
+_orchestration_backlog = 0
+# Strong references so pending orchestration tasks are not garbage collected.
+_orchestration_tasks: set[asyncio.Task] = set()
+
+
+def _reserve_orchestration_slot() -> None:
+    """Claim a backlog slot for one orchestration; raise 503 if the backlog is full."""
+    global _orchestration_backlog
+    if _orchestration_backlog >= _MAX_ORCHESTRATION_BACKLOG:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many plans are in progress. Please try again shortly.",
+        )
+    _orchestration_backlog += 1
+
+
+def _release_orchestration_slot() -> None:
+    global _orchestration_backlog
+    _orchestration_backlog -= 1
+
+
+def _orchestration_done(task: asyncio.Task) -> None:
+    _orchestration_tasks.discard(task)
+    _release_orchestration_slot()
+
+
+async def _run_orchestration_limited(user_id: str, input_task: InputTask) -> None:
+    """Run one orchestration once a concurrency slot is free, logging failures."""
+    async with _orchestration_sem:
+        try:
+            await _orchestration_manager().run_orchestration(user_id, input_task)
+        except Exception:
+            logger.error("Orchestration failed for user %s", user_id, exc_info=True)
+
+
+def _start_orchestration(user_id: str, input_task: InputTask) -> asyncio.Task:
+    """Schedule an orchestration on a reserved slot; the slot is freed when the task ends."""
+    try:
+        task = asyncio.create_task(_run_orchestration_limited(user_id, input_task))
+    except Exception:
+        _release_orchestration_slot()
+        raise
+    _orchestration_tasks.add(task)
+    task.add_done_callback(_orchestration_done)
+    return task
+
+
+async def cancel_orchestrations() -> None:
+    """Cancel running and queued orchestrations and wait for them (app shutdown)."""
+    tasks = list(_orchestration_tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
 # ---------------------------------------------------------------------------
 # Endpoints (InputTask imported from src.backend.common.models.messages_af)
 # ---------------------------------------------------------------------------
@@ -39,37 +247,15 @@ plan_router = APIRouter(tags=["Plans"])
 
 @plan_router.post("/process_request")
 async def process_request(
-    background_tasks: BackgroundTasks, input_task: InputTask, request: Request
+    input_task: InputTask,
+    user_id: str = Depends(get_current_user_id),
 ):
     """Create a new plan without full processing.
 
     Creates a plan, validates RAI compliance, and starts background orchestration.
     """
-    authenticated_user = get_authenticated_user_details(request_headers=request.headers)
-    user_id = authenticated_user["user_principal_id"]
-    if not user_id:
-        track_event_if_configured(
-            "UserIdNotFound", {"status_code": 400, "detail": "no user"}
-        )
-        raise HTTPException(status_code=400, detail="no user found")
-
     try:
-        memory_store = await DatabaseFactory.get_database(user_id=user_id)
-        user_current_team = await memory_store.get_current_team(user_id=user_id)
-        team_id = None
-        if user_current_team:
-            team_id = user_current_team.team_id
-        if not team_id:
-            raise HTTPException(
-                status_code=404,
-                detail="No team selected. Please select a team first.",
-            )
-        team = await memory_store.get_team_by_id(team_id=team_id)
-        if not team:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Team configuration '{team_id}' not found or access denied",
-            )
+        memory_store, team_id, team = await _resolve_team(user_id)
     except Exception as e:
         raise HTTPException(
             status_code=400,
@@ -90,6 +276,10 @@ async def process_request(
             detail="Request contains content that doesn't meet our safety guidelines, try again.",
         )
 
+    # Claim the orchestration slot before the plan is stored, so a full
+    # backlog rejects the request without leaving an orphaned plan behind.
+    _reserve_orchestration_slot()
+
     if not input_task.session_id:
         input_task.session_id = str(uuid.uuid4())
     try:
@@ -118,7 +308,8 @@ async def process_request(
             },
         )
     except Exception as e:
-        logger.error(f"Error creating plan: {e}")
+        _release_orchestration_slot()
+        logger.error("Error creating plan: %s", e)
         track_event_if_configured(
             "PlanCreationFailed",
             {
@@ -132,11 +323,7 @@ async def process_request(
         raise HTTPException(status_code=500, detail="Failed to create plan") from e
 
     try:
-
-        async def run_orchestration_task():
-            await OrchestrationManager().run_orchestration(user_id, input_task)
-
-        background_tasks.add_task(run_orchestration_task)
+        _start_orchestration(user_id, input_task)
 
         return {
             "status": "Request started successfully",
@@ -160,44 +347,28 @@ async def process_request(
 
 @plan_router.post("/plan_approval")
 async def plan_approval(
-    human_feedback: messages.PlanApprovalResponse, request: Request
+    human_feedback: messages.PlanApprovalResponse,
+    user_id: str = Depends(get_current_user_id),
 ):
     """Endpoint to receive plan approval or rejection from the user."""
-    authenticated_user = get_authenticated_user_details(request_headers=request.headers)
-    user_id = authenticated_user["user_principal_id"]
-    if not user_id:
-        raise HTTPException(
-            status_code=401, detail="Missing or invalid user information"
-        )
     # Set the approval in the orchestration config
     try:
         if user_id and human_feedback.m_plan_id:
-            if (
-                orchestration_config
-                and human_feedback.m_plan_id in orchestration_config.approvals
+            if orchestration_config and orchestration_config.set_approval_result(
+                human_feedback.m_plan_id, human_feedback.approved
             ):
-                orchestration_config.set_approval_result(
-                    human_feedback.m_plan_id, human_feedback.approved
-                )
-                logger.info(f"Plan approval received: {human_feedback}")
+                logger.info("Plan approval received: %s", human_feedback)
 
                 try:
                     result = await PlanService.handle_plan_approval(
                         human_feedback, user_id
                     )
-                    logger.info(f"Plan approval processed: {result}")
+                    logger.info("Plan approval processed: %s", result)
 
                 except ValueError as ve:
-                    logger.error(f"ValueError processing plan approval: {ve}")
+                    logger.error("ValueError processing plan approval: %s", ve)
                     await connection_config.send_status_update_async(
-                        {
-                            "type": WebsocketMessageType.ERROR_MESSAGE,
-                            "data": {
-                                "content": "Approval failed due to invalid input.",
-                                "status": "error",
-                                "timestamp": asyncio.get_event_loop().time(),
-                            },
-                        },
+                        _ws_error("Approval failed due to invalid input."),
                         user_id,
                         message_type=WebsocketMessageType.ERROR_MESSAGE,
                     )
@@ -205,14 +376,7 @@ async def plan_approval(
                 except Exception:
                     logger.error("Error processing plan approval", exc_info=True)
                     await connection_config.send_status_update_async(
-                        {
-                            "type": WebsocketMessageType.ERROR_MESSAGE,
-                            "data": {
-                                "content": "An unexpected error occurred while processing the approval.",
-                                "status": "error",
-                                "timestamp": asyncio.get_event_loop().time(),
-                            },
-                        },
+                        _ws_error("An unexpected error occurred while processing the approval."),
                         user_id,
                         message_type=WebsocketMessageType.ERROR_MESSAGE,
                     )
@@ -230,62 +394,38 @@ async def plan_approval(
 
                 return {"status": "approval recorded"}
             else:
-                logging.warning(
+                logger.warning(
                     "No orchestration or plan found for plan_id: %s",
                     human_feedback.m_plan_id
                 )
                 raise HTTPException(
                     status_code=404, detail="No active plan found for approval"
                 )
+    except HTTPException:
+        # e.g. the 404 above: not a server error, and no WebSocket frame.
+        raise
     except Exception as e:
-        logging.error(f"Error processing plan approval: {e}")
+        logger.error("Error processing plan approval: %s", e)
         try:
             await connection_config.send_status_update_async(
-                {
-                    "type": WebsocketMessageType.ERROR_MESSAGE,
-                    "data": {
-                        "content": "An error occurred while processing your approval request.",
-                        "status": "error",
-                        "timestamp": asyncio.get_event_loop().time(),
-                    },
-                },
+                _ws_error("An error occurred while processing your approval request."),
                 user_id,
                 message_type=WebsocketMessageType.ERROR_MESSAGE,
             )
         except Exception as ws_error:
             # Don't let WebSocket send failure break the HTTP response
-            logging.warning(f"Failed to send WebSocket error: {ws_error}")
+            logger.warning("Failed to send WebSocket error: %s", ws_error)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
 @plan_router.post("/user_clarification")
 async def user_clarification(
-    human_feedback: messages.UserClarificationResponse, request: Request
+    human_feedback: messages.UserClarificationResponse,
+    user_id: str = Depends(get_current_user_id),
 ):
     """Endpoint to receive user clarification responses for clarification requests sent by the system."""
-    authenticated_user = get_authenticated_user_details(request_headers=request.headers)
-    user_id = authenticated_user["user_principal_id"]
-    if not user_id:
-        raise HTTPException(
-            status_code=401, detail="Missing or invalid user information"
-        )
     try:
-        memory_store = await DatabaseFactory.get_database(user_id=user_id)
-        user_current_team = await memory_store.get_current_team(user_id=user_id)
-        team_id = None
-        if user_current_team:
-            team_id = user_current_team.team_id
-        if not team_id:
-            raise HTTPException(
-                status_code=404,
-                detail="No team selected. Please select a team first.",
-            )
-        team = await memory_store.get_team_by_id(team_id=team_id)
-        if not team:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Team configuration '{team_id}' not found or access denied",
-            )
+        memory_store, team_id, team = await _resolve_team(user_id)
     except Exception as e:
         raise HTTPException(
             status_code=400,
@@ -320,23 +460,20 @@ async def user_clarification(
                     },
                 )
 
-        if (
-            orchestration_config
-            and human_feedback.request_id in orchestration_config.clarifications
+        # Use the new event-driven method to set clarification result; it
+        # reports False when no clarification is pending for this request.
+        if orchestration_config and orchestration_config.set_clarification_result(
+            human_feedback.request_id, human_feedback.answer
         ):
-            # Use the new event-driven method to set clarification result
-            orchestration_config.set_clarification_result(
-                human_feedback.request_id, human_feedback.answer
-            )
             try:
                 result = await PlanService.handle_human_clarification(
                     human_feedback, user_id
                 )
-                logger.info(f"Human clarification processed: {result}")
+                logger.info("Human clarification processed: %s", result)
             except ValueError as ve:
-                logger.error(f"ValueError processing human clarification: {ve}")
+                logger.error("ValueError processing human clarification: %s", ve)
             except Exception as e:
-                logger.error(f"Error processing human clarification: {e}")
+                logger.error("Error processing human clarification: %s", e)
             track_event_if_configured(
                 "HumanClarificationReceived",
                 {
@@ -349,8 +486,9 @@ async def user_clarification(
                 "status": "clarification recorded",
             }
         else:
-            logging.warning(
-                f"No orchestration or plan found for request_id: {human_feedback.request_id}"
+            logger.warning(
+                "No orchestration or plan found for request_id: %s",
+                human_feedback.request_id,
             )
             raise HTTPException(
                 status_code=404, detail="No active plan found for clarification"
@@ -359,24 +497,19 @@ async def user_clarification(
 
 @plan_router.post("/agent_message")
 async def agent_message_user(
-    agent_message: messages.AgentMessageResponse, request: Request
+    agent_message: messages.AgentMessageResponse,
+    user_id: str = Depends(get_current_user_id),
 ):
     """Endpoint to receive messages from agents (agent -> user communication)."""
-    authenticated_user = get_authenticated_user_details(request_headers=request.headers)
-    user_id = authenticated_user["user_principal_id"]
-    if not user_id:
-        raise HTTPException(
-            status_code=401, detail="Missing or invalid user information"
-        )
     # Set the approval in the orchestration config
 
     try:
         result = await PlanService.handle_agent_messages(agent_message, user_id)
-        logger.info(f"Agent message processed: {result}")
+        logger.info("Agent message processed: %s", result)
     except ValueError as ve:
-        logger.error(f"ValueError processing agent message: {ve}")
+        logger.error("ValueError processing agent message: %s", ve)
     except Exception as e:
-        logger.error(f"Error processing agent message: {e}")
+        logger.error("Error processing agent message: %s", e)
 
     track_event_if_configured(
         "AgentMessageReceived",
@@ -392,22 +525,14 @@ async def agent_message_user(
 
 
 @plan_router.get("/plans")
-async def get_plans(request: Request):
+async def get_plans(
+    user_id: str = Depends(get_current_user_id),
+    memory_store: DatabaseBase = Depends(get_memory_store),
+):
     """Retrieve plans for the current user.
 
     Gets completed plans for the user's current team.
     """
-    authenticated_user = get_authenticated_user_details(request_headers=request.headers)
-    user_id = authenticated_user["user_principal_id"]
-    if not user_id:
-        track_event_if_configured(
-            "UserIdNotFound", {"status_code": 400, "detail": "no user"}
-        )
-        raise HTTPException(status_code=400, detail="no user")
-
-    # Initialize memory context
-    memory_store = await DatabaseFactory.get_database(user_id=user_id)
-
     current_team = await memory_store.get_current_team(user_id=user_id)
     if not current_team:
         return []
@@ -421,20 +546,10 @@ async def get_plans(request: Request):
 
 @plan_router.get("/plan")
 async def get_plan_by_id(
-    request: Request,
     plan_id: Optional[str] = Query(None),
+    memory_store: DatabaseBase = Depends(get_memory_store),
 ):
     """Retrieve a specific plan by ID."""
-    authenticated_user = get_authenticated_user_details(request_headers=request.headers)
-    user_id = authenticated_user["user_principal_id"]
-    if not user_id:
-        track_event_if_configured(
-            "UserIdNotFound", {"status_code": 400, "detail": "no user"}
-        )
-        raise HTTPException(status_code=400, detail="no user")
-
-    # Initialize memory context
-    memory_store = await DatabaseFactory.get_database(user_id=user_id)
     try:
         if plan_id:
             plan = await memory_store.get_plan_by_plan_id(plan_id=plan_id)
@@ -447,8 +562,13 @@ async def get_plan_by_id(
 
             # Use get_steps_by_plan to match the original implementation
 
-            team = await memory_store.get_team_by_id(team_id=plan.team_id) if plan.team_id else None
-            agent_messages = await memory_store.get_agent_messages(plan_id=plan.plan_id)
+            # The team and message lookups are independent; run them concurrently.
+            team, agent_messages = await asyncio.gather(
+                memory_store.get_team_by_id(team_id=plan.team_id)
+                if plan.team_id
+                else asyncio.sleep(0),  # resolves to None
+                memory_store.get_agent_messages(plan_id=plan.plan_id),
+            )
             mplan = plan.m_plan if plan.m_plan else None
             streaming_message = plan.streaming_message if plan.streaming_message else ""
             plan.streaming_message = ""  # clear streaming message after retrieval
@@ -466,5 +586,5 @@ async def get_plan_by_id(
             )
             raise HTTPException(status_code=400, detail="no plan id")
     except Exception as e:
-        logging.error(f"Error retrieving plan: {str(e)}")
+        logger.error("Error retrieving plan: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error occurred")
@@ -17,6 +17,7 @@ from src.backend.auth.auth_utils import get_authenticated_user_details
 from src.backend.common.database.database_factory import DatabaseFactory
 from src.backend.common.utils.event_utils import track_event_if_configured
 from src.backend.common.utils.utils_af import find_first_available_team, rai_validate_team_config
+from src.backend.v4.api.plan_router import invalidate_team_cache
 from src.backend.v4.common.services.team_service import TeamService
 from src.backend.v4.config.settings import team_config
 from src.backend.v4.orchestration.orchestration_manager import OrchestrationManager
@@ -50,7 +51,7 @@ async def init_team(
     Gets first available team from 4 to 1 (RFP -> Retail -> Marketing -> HR).
     Falls back to HR if no teams are available.
     """
-    logger.info(f"Init team called, team_switched={team_switched}")
+    logger.info("Init team called, team_switched=%s", team_switched)
     try:
         authenticated_user = get_authenticated_user_details(
             request_headers=request.headers
@@ -84,12 +85,13 @@ async def init_team(
         # Use current team if available, otherwise use found team
         if user_current_team:
             init_team_id = user_current_team.team_id
-            logger.info(f"Using user's current team: {init_team_id}")
+            logger.info("Using user's current team: %s", init_team_id)
         elif init_team_id:
-            logger.info(f"Using first available team: {init_team_id}")
+            logger.info("Using first available team: %s", init_team_id)
             user_current_team = await team_service.handle_team_selection(
                 user_id=user_id, team_id=init_team_id
             )
+            invalidate_team_cache(user_id)
             if user_current_team:
                 init_team_id = user_current_team.team_id
 
@@ -108,7 +110,8 @@ async def init_team(
         if team_configuration is None:
             # If team doesn't exist, clear current team and return empty state
             await memory_store.delete_current_team(user_id)
-            logger.info(f"Team configuration '{init_team_id}' not found. Cleared current team.")
+            invalidate_team_cache(user_id)
+            logger.info("Team configuration '%s' not found. Cleared current team.", init_team_id)
             return {
                 "status": "Current team configuration not found. Please select or upload a team configuration.",
                 "team_id": None,
@@ -234,12 +237,12 @@ async def upload_team_config(
         )
 
         # Validate search indexes
-        logger.info(f"🔍 Validating search indexes for user: {user_id}")
+        logger.info("🔍 Validating search indexes for user: %s", user_id)
         search_valid, search_errors = await team_service.validate_team_search_indexes(
             json_data
         )
         if not search_valid:
-            logger.warning(f"❌ Search validation failed for user {user_id}: {search_errors}")
+            logger.warning("❌ Search validation failed for user %s: %s", user_id, search_errors)
             error_message = (
                 f"Search index validation failed:\n\n{chr(10).join([f'• {error}' for error in search_errors])}\n\n"
                 f"Please ensure all referenced search indexes exist in your Azure AI Search service."
@@ -255,7 +258,7 @@ async def upload_team_config(
             )
             raise HTTPException(status_code=400, detail=error_message)
 
-        logger.info(f"✅ Search validation passed for user: {user_id}")
+        logger.info("✅ Search validation passed for user: %s", user_id)
         track_event_if_configured(
             "Team configuration search validation passed",
             {"status": "passed", "user_id": user_id, "filename": file.filename},
@@ -271,11 +274,12 @@ async def upload_team_config(
 
         # Save the configuration
         try:
-            logger.info(f"Saving team configuration... team_id={team_id}")
+            logger.info("Saving team configuration... team_id=%s", team_id)
             if team_id:
                 team_cfg.team_id = team_id
                 team_cfg.id = team_id  # Ensure id is also set for updates
             team_id = await team_service.save_team_configuration(team_cfg)
+            invalidate_team_cache()
         except ValueError as e:
             raise HTTPException(
                 status_code=500, detail=f"Failed to save configuration: {str(e)}"
@@ -303,7 +307,7 @@ async def upload_team_config(
     except HTTPException:
         raise
     except Exception as e:
-        logging.error("Unexpected error uploading team configuration: %s", str(e))
+        logger.error("Unexpected error uploading team configuration: %s", str(e))
         raise HTTPException(status_code=500, detail="Internal server error occurred")
 
 
@@ -332,7 +336,7 @@ async def get_team_configs(request: Request):
         return configs_dict
 
     except Exception as e:
-        logging.error(f"Error retrieving team configurations: {str(e)}")
+        logger.error("Error retrieving team configurations: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error occurred")
 
 
@@ -365,7 +369,7 @@ async def get_team_config_by_id(team_id: str, request: Request):
         # Re-raise HTTP exceptions
         raise
     except Exception as e:
-        logging.error(f"Error retrieving team configuration: {str(e)}")
+        logger.error("Error retrieving team configuration: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error occurred")
 
 
@@ -390,6 +394,7 @@ async def delete_team_config(team_id: str, request: Request):
 
         # Delete the team configuration
         deleted = await team_service.delete_team_configuration(team_id, user_id)
+        invalidate_team_cache()
 
         if not deleted:
             raise HTTPException(status_code=404, detail="Team configuration not found")
@@ -410,7 +415,7 @@ async def delete_team_config(team_id: str, request: Request):
         # Re-raise HTTP exceptions
         raise
     except Exception as e:
-        logging.error(f"Error deleting team configuration: {str(e)}")
+        logger.error("Error deleting team configuration: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error occurred")
 
 
@@ -445,6 +450,7 @@ async def select_team(selection: TeamSelectionRequest, request: Request):
         set_team = await team_service.handle_team_selection(
             user_id=user_id, team_id=selection.team_id
         )
+        invalidate_team_cache(user_id)
         if not set_team:
             track_event_if_configured(
                 "Team selected",
@@ -489,7 +495,7 @@ async def select_team(selection: TeamSelectionRequest, request: Request):
         # Re-raise HTTP exceptions
         raise
     except Exception as e:
-        logging.error(f"Error selecting team: {str(e)}")
+        logger.error("Error selecting team: %s", e)
         track_event_if_configured(
             "Team selection error",
             {
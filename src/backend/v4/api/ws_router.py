@@ -52,11 +52,11 @@ async def start_comms(
             # the connection open and does not take cpu cycle
             try:
                 message = await websocket.receive_text()
-                logging.debug(f"Received WebSocket message from {user_id}: {message}")
+                logger.debug("Received WebSocket message from %s: %s", user_id, message)
             except asyncio.TimeoutError:
                 # Ignore timeouts to keep the WebSocket connection open, but avoid a tight loop.
-                logging.debug(
-                    f"WebSocket receive timeout for user {user_id}, process {process_id}"
+                logger.debug(
+                    "WebSocket receive timeout for user %s, process %s", user_id, process_id
                 )
                 await asyncio.sleep(0.1)
             except WebSocketDisconnect:
@@ -64,10 +64,10 @@ async def start_comms(
                     "WebSocketDisconnect",
                     {"process_id": process_id, "user_id": user_id},
                 )
-                logging.info(f"Client disconnected from batch {process_id}")
+                logger.info("Client disconnected from batch %s", process_id)
                 break
     except Exception as e:
-        logging.error(f"Error in WebSocket connection: {str(e)}")
+        logger.error("Error in WebSocket connection: %s", e)
     finally:
         # Always clean up the connection
         await connection_config.close_connection(process_id=process_id)
@@ -7,7 +7,7 @@ from src.backend.common.database.database_factory import DatabaseFactory
 from src.backend.common.models.messages_af import (
     AgentMessageData,
     AgentMessageType,
-    AgentType,
+    HUMAN_AGENT_VALUE,
     PlanStatus,
 )
 from src.backend.common.utils.event_utils import track_event_if_configured
@@ -29,7 +29,7 @@ def build_agent_message_from_user_clarification(
         plan_id=human_feedback.plan_id or "",
         user_id=user_id,
         m_plan_id=human_feedback.m_plan_id or None,
-        agent=AgentType.HUMAN.value,  # or simply "Human_Agent"
+        agent=HUMAN_AGENT_VALUE,  # "Human_Agent"
         agent_type=AgentMessageType.HUMAN_AGENT,  # will serialize per current enum definition
         content=human_feedback.answer or "",
         raw_data=json.dumps(asdict(human_feedback)),
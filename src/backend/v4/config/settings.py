@@ -112,11 +112,18 @@ class OrchestrationConfig:
         else:
             self._approval_events[plan_id].clear()
 
-    def set_approval_result(self, plan_id: str, approved: bool) -> None:
-        """Set approval decision and trigger its event."""
+    def set_approval_result(self, plan_id: str, approved: bool) -> bool:
+        """Set approval decision and trigger its event.
+
+        Returns False (and records nothing) if no approval is pending for plan_id.
+        """
+        if plan_id not in self.approvals:
+            return False
         self.approvals[plan_id] = approved
-        if plan_id in self._approval_events:
-            self._approval_events[plan_id].set()
+        event = self._approval_events.get(plan_id)
+        if event is not None:
+            event.set()
+        return True
 
     async def wait_for_approval(self, plan_id: str, timeout: Optional[float] = None) -> bool:
         """
@@ -142,7 +149,9 @@ class OrchestrationConfig:
 
         # Already decided
         if self.approvals[plan_id] is not None:
-            return self.approvals[plan_id]
+            approved = self.approvals[plan_id]
+            self.cleanup_approval(plan_id)
+            return approved
 
         if plan_id not in self._approval_events:
             self._approval_events[plan_id] = asyncio.Event()
@@ -163,8 +172,9 @@ class OrchestrationConfig:
             logger.error("Unexpected error waiting for approval %s: %s", plan_id, e)
             raise
         finally:
-            if plan_id in self.approvals and self.approvals[plan_id] is None:
-                self.cleanup_approval(plan_id)
+            # The waiter is the only consumer, so drop the entry once it is
+            # done; otherwise every decided approval would stay in memory.
+            self.cleanup_approval(plan_id)
 
     def set_clarification_pending(self, request_id: str) -> None:
         """Mark clarification pending and create/reset its event."""
@@ -174,11 +184,18 @@ class OrchestrationConfig:
         else:
             self._clarification_events[request_id].clear()
 
-    def set_clarification_result(self, request_id: str, answer: str) -> None:
-        """Set clarification answer and trigger event."""
+    def set_clarification_result(self, request_id: str, answer: str) -> bool:
+        """Set clarification answer and trigger event.
+
+        Returns False (and records nothing) if no clarification is pending for request_id.
+        """
+        if request_id not in self.clarifications:
+            return False
         self.clarifications[request_id] = answer
-        if request_id in self._clarification_events:
-            self._clarification_events[request_id].set()
+        event = self._clarification_events.get(request_id)
+        if event is not None:
+            event.set()
+        return True
 
     async def wait_for_clarification(self, request_id: str, timeout: Optional[float] = None) -> str:
         """Wait for clarification response with timeout."""
@@ -189,7 +206,9 @@ class OrchestrationConfig:
             raise KeyError(f"Request ID {request_id} not found in clarifications")
 
         if self.clarifications[request_id] is not None:
-            return self.clarifications[request_id]
+            answer = self.clarifications[request_id]
+            self.cleanup_clarification(request_id)
+            return answer
 
         if request_id not in self._clarification_events:
             self._clarification_events[request_id] = asyncio.Event()
@@ -207,8 +226,8 @@ class OrchestrationConfig:
             logger.error("Unexpected error waiting for clarification %s: %s", request_id, e)
             raise
         finally:
-            if request_id in self.clarifications and self.clarifications[request_id] is None:
-                self.cleanup_clarification(request_id)
+            # Drop the entry once the single waiter is done with it.
+            self.cleanup_clarification(request_id)
 
     def cleanup_approval(self, plan_id: str) -> None:
         """Remove approval tracking data and event."""
@@ -12,8 +12,11 @@ from __future__ import annotations
 import json
 import os
 import re
+import threading
+import time
 from dataclasses import dataclass
-from typing import Any
+from functools import lru_cache
+from typing import Any, Iterable
 
 from dotenv import load_dotenv
 
@@ -28,6 +31,7 @@ def _norm(s: str | None) -> str:
     return re.sub(r"[^\w]", "", s or "").lower()
 
 
+@lru_cache(maxsize=256)
 def _col_to_a1(col_index_zero_based: int) -> str:
     """Convert 0-based column index to A1 column letters (0->A, 25->Z, 26->AA)."""
 
@@ -91,6 +95,32 @@ def find_values_for_rows_containing(
     Column selection uses the same fuzzy-header matching as `find_value_in_table`.
     """
 
+    return find_values_for_rows_containing_any(
+        rows=rows,
+        row_substrings=(row_substring,),
+        col_header=col_header,
+        header_row_index=header_row_index,
+        header_search_rows=header_search_rows,
+    )[row_substring]
+
+
+def find_values_for_rows_containing_any(
+    *,
+    rows: list[list[str]],
+    row_substrings: Iterable[str],
+    col_header: str,
+    header_row_index: int | None = None,
+    header_search_rows: int = 10,
+) -> dict[str, list[SheetRowMatch]]:
+    """`find_values_for_rows_containing` for several substrings in one pass over `rows`.
+
+    Each row's text is normalised once and tested against every substring.
+    Returns a list of matches per substring, keyed by the substring as given.
+    """
+
+    needles = {sub: _norm(sub) for sub in row_substrings}
+    out: dict[str, list[SheetRowMatch]] = {sub: [] for sub in needles}
+
     # Determine header row
     detected_header_row_index: int | None = header_row_index
     if detected_header_row_index is None:
@@ -99,7 +129,7 @@ def find_values_for_rows_containing(
                 detected_header_row_index = i
                 break
     if detected_header_row_index is None:
-        return []
+        return out
 
     header = rows[detected_header_row_index]
     col_index: int | None = None
@@ -109,22 +139,27 @@ def find_values_for_rows_containing(
             col_index = j
             break
     if col_index is None:
-        return []
+        return out
+
+    active = [(out[sub], row_needle) for sub, row_needle in needles.items() if row_needle]
+    if not active:
+        return out
 
-    row_needle = _norm(row_substring)
-    out: list[SheetRowMatch] = []
     for i, r in enumerate(rows):
         row_text = " ".join([c for c in r if c]).strip()
-        if row_needle and row_needle in _norm(row_text):
-            value = r[col_index] if col_index < len(r) else None
-            out.append(
-                SheetRowMatch(
-                    row_index=i,
-                    col_index=col_index,
-                    row_text=row_text,
-                    value=value,
-                )
-            )
+        norm_text = _norm(row_text)
+        match: SheetRowMatch | None = None
+        for matches, row_needle in active:
+            if row_needle in norm_text:
+                if match is None:
+                    value = r[col_index] if col_index < len(r) else None
+                    match = SheetRowMatch(
+                        row_index=i,
+                        col_index=col_index,
+                        row_text=row_text,
+                        value=value,
+                    )
+                matches.append(match)
 
     return out
 
@@ -213,9 +248,16 @@ def find_value_in_table(
 
 
 class GoogleSheetsReader:
-    # Class-level cache for Google Sheets service instances
-    # Key: (service_account_path, readonly) -> service instance
-    _service_cache: dict[tuple[str, bool], Any] = {}
+    # Per-thread cache for Google Sheets service instances
+    # Key: (service_account_path, readonly) -> service instance.
+    # googleapiclient services wrap a non-thread-safe httplib2 connection, so
+    # readers used from worker threads (asyncio.to_thread) each get their own;
+    # a thread's services are dropped when the thread exits.
+    _service_local = threading.local()
+
+    # spreadsheet_id -> (monotonic fetch time, sheet titles)
+    _titles_cache: dict[str, tuple[float, list[str]]] = {}
+    _TITLES_TTL_SECONDS = 60.0
 
     def __init__(
         self,
@@ -265,13 +307,14 @@ class GoogleSheetsReader:
         """Build or retrieve cached Google Sheets service.
 
         The service instance is cached per (service_account_path, readonly) pair
-        to avoid rebuilding credentials and the API client on every call.
+        and thread to avoid rebuilding credentials and the API client on every call.
         """
         cache_key = (self._service_account_path, readonly)
+        service_cache = self._thread_service_cache()
 
         # Check cache first
-        if cache_key in GoogleSheetsReader._service_cache:
-            return GoogleSheetsReader._service_cache[cache_key]
+        if cache_key in service_cache:
+            return service_cache[cache_key]
 
         # Lazy import so unit tests that only use the deterministic helpers
         # do not require Google client libs.
@@ -302,27 +345,46 @@ class GoogleSheetsReader:
         )
 
         # Cache the service instance
-        GoogleSheetsReader._service_cache[cache_key] = service
+        service_cache[cache_key] = service
 
         return service
 
+    @staticmethod
+    def _thread_service_cache() -> dict[tuple[str, bool], Any]:
+        """Return the calling thread's service cache, creating it on first use."""
+        local = GoogleSheetsReader._service_local
+        cache = getattr(local, "services", None)
+        if cache is None:
+            cache = local.services = {}
+        return cache
+
     @classmethod
     def clear_service_cache(cls) -> None:
         """Clear the service cache. Useful for testing or credential rotation."""
-        cls._service_cache.clear()
+        # Other threads' caches can't be reached from here; swapping in a fresh
+        # thread-local drops them all.
+        GoogleSheetsReader._service_local = threading.local()
+        cls._titles_cache.clear()
 
     @property
     def spreadsheet_id(self) -> str:
         return self._spreadsheet_id
 
     def list_sheet_titles(self) -> list[str]:
+        """Sheet (tab) titles, cached per spreadsheet for a short TTL."""
+        cached = GoogleSheetsReader._titles_cache.get(self._spreadsheet_id)
+        if cached is not None and time.monotonic() - cached[0] < self._TITLES_TTL_SECONDS:
+            return list(cached[1])
+
         sheets = self._build_sheets_service(readonly=True)
         meta = (
             sheets.spreadsheets()
             .get(spreadsheetId=self._spreadsheet_id, fields="sheets(properties(title))")
             .execute(num_retries=2)
         )
-        return [s["properties"]["title"] for s in meta.get("sheets", [])]
+        titles = [s["properties"]["title"] for s in meta.get("sheets", [])]
+        GoogleSheetsReader._titles_cache[self._spreadsheet_id] = (time.monotonic(), titles)
+        return list(titles)
 
     def fetch_rows(self, *, a1_range: str) -> list[list[str]]:
         sheets = self._build_sheets_service(readonly=True)
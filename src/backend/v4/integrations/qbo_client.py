@@ -11,13 +11,22 @@ from __future__ import annotations
 
 import json
 import os
+import threading
 import time
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Iterator
 
 import requests
 from dotenv import dotenv_values, load_dotenv
 from intuitlib.client import AuthClient
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
 
 load_dotenv(override=False)
 
@@ -36,6 +45,25 @@ if not os.environ.get("QBO_CLIENT_ID"):
                 os.environ[k] = v
 
 
+# Refresh proactively when the access token is this close to expiring.
+_TOKEN_EXPIRY_SKEW_SECONDS = 60
+
+
+@contextmanager
+def _exclusive_file_lock(path: str) -> Iterator[None]:
+    """Hold an advisory lock so concurrent processes share a single token refresh."""
+
+    if fcntl is None:
+        yield
+        return
+    with open(path, "a", encoding="utf-8") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
 @dataclass(slots=True)
 class QBOAuthTokens:
     environment: str
@@ -44,6 +72,18 @@ class QBOAuthTokens:
     refresh_token: str
     id_token: str | None = None
     saved_at_unix: int | None = None
+    expires_at_unix: int | None = None
+
+    def is_expired(self, *, skew_seconds: int = _TOKEN_EXPIRY_SKEW_SECONDS) -> bool:
+        """True when the access token is known to expire within `skew_seconds`.
+
+        Token files written before `expires_at_unix` was recorded are treated as
+        valid; the 401 retry path still covers them.
+        """
+
+        if self.expires_at_unix is None:
+            return False
+        return time.time() > self.expires_at_unix - skew_seconds
 
 
 class QBOClient:
@@ -63,6 +103,35 @@ class QBOClient:
         self._environment = environment
         self._tokens_path = tokens_path
         self._timeout_seconds = timeout_seconds
+        self._refresh_lock = threading.Lock()
+        self._session = self._build_session()
+
+    @staticmethod
+    def _build_session() -> requests.Session:
+        """Create a pooled HTTP session so repeated calls reuse TCP/TLS connections.
+
+        Sized for the concurrent report probes; transient 429/5xx responses are
+        retried with backoff (GET only, which is all this client issues).
+        """
+
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=10,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.2,
+                status_forcelist=(429, 502, 503, 504),
+                raise_on_status=False,
+            ),
+        )
+        session.mount("https://", adapter)
+        return session
+
+    def close(self) -> None:
+        """Release pooled connections."""
+
+        self._session.close()
 
     @staticmethod
     def _base_url(environment: str) -> str:
@@ -113,6 +182,7 @@ class QBOClient:
             refresh_token=raw["refresh_token"],
             id_token=raw.get("id_token"),
             saved_at_unix=raw.get("saved_at_unix"),
+            expires_at_unix=raw.get("expires_at_unix"),
         )
 
     def save_tokens(self, tokens: QBOAuthTokens) -> None:
@@ -123,9 +193,15 @@ class QBOClient:
             "refresh_token": tokens.refresh_token,
             "id_token": tokens.id_token,
             "saved_at_unix": int(time.time()),
+            "expires_at_unix": tokens.expires_at_unix,
         }
-        with open(self._tokens_path, "w", encoding="utf-8") as f:
+        # Write-then-rename so readers never observe a truncated token file.
+        tmp_path = f"{self._tokens_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
             json.dump(payload, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._tokens_path)
 
     def refresh_tokens(self, tokens: QBOAuthTokens) -> QBOAuthTokens:
         auth = AuthClient(
@@ -145,17 +221,40 @@ class QBOClient:
                 "QBO token refresh failed (missing refreshed access_token/refresh_token)"
             )
 
+        now = int(time.time())
         updated = QBOAuthTokens(
             environment=tokens.environment,
             realm_id=auth.realm_id or tokens.realm_id,
             access_token=auth.access_token,
             refresh_token=auth.refresh_token,
             id_token=auth.id_token,
-            saved_at_unix=int(time.time()),
+            saved_at_unix=now,
+            expires_at_unix=now + int(auth.expires_in) if auth.expires_in else None,
         )
         self.save_tokens(updated)
         return updated
 
+    def _refresh_shared(self, stale: QBOAuthTokens) -> QBOAuthTokens:
+        """Refresh `stale` tokens at most once across threads and processes.
+
+        Another worker may already have refreshed while we waited for the lock; in
+        that case reuse the tokens it saved instead of rotating them again.
+        """
+
+        with self._refresh_lock, _exclusive_file_lock(f"{self._tokens_path}.lock"):
+            current = self.load_tokens()
+            if current.access_token != stale.access_token and not current.is_expired():
+                return current
+            return self.refresh_tokens(current)
+
+    def _load_valid_tokens(self) -> QBOAuthTokens:
+        """Load saved tokens, refreshing first only if the access token is expiring."""
+
+        tokens = self.load_tokens()
+        if tokens.is_expired():
+            tokens = self._refresh_shared(tokens)
+        return tokens
+
     def _request_json(
         self,
         method: str,
@@ -164,7 +263,7 @@ class QBOClient:
         bearer_token: str,
         params: dict[str, str] | None = None,
     ) -> dict[str, Any]:
-        resp = requests.request(
+        resp = self._session.request(
             method,
             url,
             headers={
@@ -184,7 +283,7 @@ class QBOClient:
         return resp.json()
 
     def get_company_info(self) -> dict[str, Any]:
-        tokens = self.load_tokens()
+        tokens = self._load_valid_tokens()
         base = self._base_url(tokens.environment)
         url = f"{base}/v3/company/{tokens.realm_id}/companyinfo/{tokens.realm_id}"
 
@@ -193,7 +292,7 @@ class QBOClient:
         except RuntimeError as e:
             # Common case: expired access token
             if "401" in str(e) or "invalid_token" in str(e).lower():
-                tokens = self.refresh_tokens(tokens)
+                tokens = self._refresh_shared(tokens)
                 return self._request_json("GET", url, bearer_token=tokens.access_token)
             raise
 
@@ -205,7 +304,7 @@ class QBOClient:
         accounting_method: str | None = None,
         date_macro: str | None = None,
     ) -> dict[str, Any]:
-        tokens = self.load_tokens()
+        tokens = self._load_valid_tokens()
         base = self._base_url(tokens.environment)
         url = f"{base}/v3/company/{tokens.realm_id}/reports/BalanceSheet"
 
@@ -226,7 +325,7 @@ class QBOClient:
             )
         except RuntimeError as e:
             if "401" in str(e) or "invalid_token" in str(e).lower():
-                tokens = self.refresh_tokens(tokens)
+                tokens = self._refresh_shared(tokens)
                 return self._request_json(
                     "GET",
                     url,
@@ -249,7 +348,7 @@ class QBOClient:
         - AgedReceivablesDetail
         """
 
-        tokens = self.load_tokens()
+        tokens = self._load_valid_tokens()
         base = self._base_url(tokens.environment)
         url = f"{base}/v3/company/{tokens.realm_id}/reports/{report_name}"
 
@@ -262,7 +361,7 @@ class QBOClient:
             )
         except RuntimeError as e:
             if "401" in str(e) or "invalid_token" in str(e).lower():
-                tokens = self.refresh_tokens(tokens)
+                tokens = self._refresh_shared(tokens)
                 return self._request_json(
                     "GET",
                     url,
@@ -354,7 +453,7 @@ class QBOClient:
         Docs: QBO supports a SQL-like query language at /v3/company/<realmId>/query.
         """
 
-        tokens = self.load_tokens()
+        tokens = self._load_valid_tokens()
         base = self._base_url(tokens.environment)
         url = f"{base}/v3/company/{tokens.realm_id}/query"
 
@@ -371,7 +470,7 @@ class QBOClient:
             )
         except RuntimeError as e:
             if "401" in str(e) or "invalid_token" in str(e).lower():
-                tokens = self.refresh_tokens(tokens)
+                tokens = self._refresh_shared(tokens)
                 return self._request_json(
                     "GET",
                     url,
@@ -409,7 +508,7 @@ class QBOClient:
         This is often a better source than BalanceSheet for account-level lines.
         """
 
-        tokens = self.load_tokens()
+        tokens = self._load_valid_tokens()
         base = self._base_url(tokens.environment)
         url = f"{base}/v3/company/{tokens.realm_id}/reports/TrialBalance"
 
@@ -428,7 +527,7 @@ class QBOClient:
             )
         except RuntimeError as e:
             if "401" in str(e) or "invalid_token" in str(e).lower():
-                tokens = self.refresh_tokens(tokens)
+                tokens = self._refresh_shared(tokens)
                 return self._request_json(
                     "GET",
                     url,
@@ -9,26 +9,44 @@ Leaf-ish rows usually contain `ColData` with a label and a value.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from decimal import Decimal, InvalidOperation
+from functools import lru_cache
 import re
 from typing import Any, Iterable
 
 
+_EXHAUSTED = object()
+
+
 @dataclass(frozen=True, slots=True)
 class ReportLineItem:
     label: str
     amount: str
+    # Casefolded label, computed once for the case-insensitive label scans.
+    label_ci: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "label_ci", self.label.casefold())
 
 
 def iter_report_line_items(rows: dict[str, Any] | None) -> Iterable[ReportLineItem]:
-    """Yield flattened report line items from a nested QBO `Rows` object."""
+    """Yield flattened report line items from a nested QBO `Rows` object.
+
+    Rows are walked depth-first in document order with an explicit stack of row
+    iterators, so deeply nested reports don't build a generator frame per level.
+    """
 
     if not rows:
         return
 
-    row_list = rows.get("Row") or []
-    for row in row_list:
+    stack = [iter(rows.get("Row") or ())]
+    while stack:
+        row = next(stack[-1], _EXHAUSTED)
+        if row is _EXHAUSTED:
+            stack.pop()
+            continue
+
         col = row.get("ColData")
         if isinstance(col, list) and len(col) >= 2:
             label = (col[0].get("value") or "").strip()
@@ -38,7 +56,7 @@ def iter_report_line_items(rows: dict[str, Any] | None) -> Iterable[ReportLineIt
 
         nested = row.get("Rows")
         if isinstance(nested, dict):
-            yield from iter_report_line_items(nested)
+            stack.append(iter(nested.get("Row") or ()))
 
 
 def extract_balance_sheet_items(report: dict[str, Any]) -> list[ReportLineItem]:
@@ -53,15 +71,20 @@ def extract_balance_sheet_items(report: dict[str, Any]) -> list[ReportLineItem]:
 def find_first_amount(items: Iterable[ReportLineItem], name_substring: str) -> str | None:
     """Return the first amount whose label contains `name_substring` (case-insensitive)."""
 
-    needle = name_substring.lower()
+    needle = name_substring.casefold()
     for item in items:
-        if needle in item.label.lower():
+        if needle in item.label_ci:
             return item.amount
     return None
 
 
+_NON_ALNUM_RE = re.compile(r"[\W_]+")
+
+
 def _norm(s: str | None) -> str:
-    return "".join(ch.lower() for ch in (s or "") if ch.isalnum())
+    kept = _NON_ALNUM_RE.sub("", s or "")
+    # Lowercase per character outside ASCII so context rules (final sigma) don't apply.
+    return kept.lower() if kept.isascii() else "".join(ch.lower() for ch in kept)
 
 
 def _extract_report_column_titles(report: dict[str, Any]) -> list[str]:
@@ -90,7 +113,7 @@ def _iter_report_coldata_rows(rows: dict[str, Any] | None) -> Iterable[list[str]
     if not rows:
         return
 
-    row_list = rows.get("Row") or []
+    row_list = rows.get("Row") or ()
     for row in row_list:
         if not isinstance(row, dict):
             continue
@@ -137,14 +160,12 @@ def extract_report_total_value(
         w = _norm(want)
         if not w:
             continue
-        for i, nt in enumerate(norm_titles):
-            if nt == w or (w and w in nt):
-                col_index = i
-                break
+        # An exact title match is also a substring match, so one test covers both.
+        col_index = next((i for i, nt in enumerate(norm_titles) if w in nt), None)
         if col_index is not None:
             break
 
-    required = [_norm(t) for t in (total_row_must_contain or []) if _norm(t)]
+    required = [tok for tok in map(_norm, total_row_must_contain or ()) if tok]
     best: tuple[str, str, int] | None = None  # (label, value, col_index_used)
 
     rows = report.get("Rows")
@@ -185,6 +206,7 @@ def extract_report_total_value(
     }
 
 
+@lru_cache(maxsize=8192)
 def _parse_decimal(value: str | None) -> Decimal | None:
     s = (value or "").strip()
     if not s:
@@ -207,6 +229,12 @@ def _parse_decimal(value: str | None) -> Decimal | None:
     return -d if neg else d
 
 
+_ZERO = Decimal("0")
+
+_BUCKET_RANGE_RE = re.compile(r"(\d+)\s*-\s*(\d+)")
+_BUCKET_OPEN_ENDED_RE = re.compile(r"(\d+)\s*(\+|and\s+over|over)")
+
+
 def _bucket_start_days(col_title: str) -> int | None:
     """Infer the lower-bound day value for an aging bucket column title.
 
@@ -224,23 +252,50 @@ def _bucket_start_days(col_title: str) -> int | None:
     if "current" in t:
         return 0
 
-    m = re.search(r"(\d+)\s*-\s*(\d+)", t)
+    m = _BUCKET_RANGE_RE.search(t) or _BUCKET_OPEN_ENDED_RE.search(t)
     if m:
-        try:
-            return int(m.group(1))
-        except Exception:
-            return None
-
-    m = re.search(r"(\d+)\s*(\+|and\s+over|over)", t)
-    if m:
-        try:
-            return int(m.group(1))
-        except Exception:
-            return None
+        return int(m.group(1))
 
     return None
 
 
+@lru_cache(maxsize=64)
+def _parse_aging_columns(titles: tuple[str, ...]) -> tuple[tuple[int, int], ...]:
+    """Return (column index, bucket start day) for each aging-bucket column.
+
+    AP and AR aging reports share a stable column layout, so this is cached by
+    the column titles and each layout is parsed once.
+    """
+
+    out: list[tuple[int, int]] = []
+    for i, title in enumerate(titles):
+        start = _bucket_start_days(title)
+        if start is not None:
+            out.append((i, start))
+    return tuple(out)
+
+
+def _sum_bucket_amounts(row_vals: list[str], bucket_indexes: list[int]) -> Decimal:
+    """Sum the amounts in `bucket_indexes` (ascending) for one aging report row.
+
+    Most vendors/customers only have a balance in one or two buckets, so blank
+    cells are skipped before parsing.
+    """
+
+    n = len(row_vals)
+    amt = _ZERO
+    for idx in bucket_indexes:
+        if idx >= n:
+            break
+        cell = row_vals[idx]
+        if not cell:
+            continue
+        d = _parse_decimal(cell)
+        if d is not None:
+            amt += d
+    return amt
+
+
 def extract_aged_detail_items_over_threshold(
     report: dict[str, Any],
     *,
@@ -264,13 +319,13 @@ def extract_aged_detail_items_over_threshold(
     bucket_indexes: list[int] = []
     bucket_titles: list[str] = []
 
-    for i, title in enumerate(norm_titles):
-        start = _bucket_start_days(title)
-        if start is None:
-            continue
+    for i, start in _parse_aging_columns(tuple(norm_titles)):
         if start > max_age_days:
             bucket_indexes.append(i)
-            bucket_titles.append(title)
+            bucket_titles.append(norm_titles[i])
+
+    # Item field keys depend only on the column titles, so normalise them once.
+    field_keys = [(i, key) for i, key in enumerate(map(_norm, norm_titles)) if key]
 
     rows = report.get("Rows")
     if not isinstance(rows, dict):
@@ -283,19 +338,11 @@ def extract_aged_detail_items_over_threshold(
     items: list[dict[str, Any]] = []
     total = Decimal("0")
 
-    for row_vals in _iter_report_coldata_rows(rows):
+    for row_vals in _iter_report_coldata_rows(rows) if bucket_indexes else ():
         if not row_vals:
             continue
-        if not bucket_indexes:
-            continue
-
-        amt = Decimal("0")
-        for idx in bucket_indexes:
-            if 0 <= idx < len(row_vals):
-                d = _parse_decimal(row_vals[idx])
-                if d is not None:
-                    amt += d
 
+        amt = _sum_bucket_amounts(row_vals, bucket_indexes)
         if amt <= 0:
             continue
 
@@ -313,10 +360,9 @@ def extract_aged_detail_items_over_threshold(
         }
 
         # Add a best-effort subset of fields by column title.
-        for i, title in enumerate(norm_titles[: min(len(norm_titles), len(row_vals))]):
-            key = _norm(title)
-            if not key:
-                continue
+        for i, key in field_keys:
+            if i >= len(row_vals):
+                break
             val = str(row_vals[i] or "").strip()
             if val:
                 item[key] = val
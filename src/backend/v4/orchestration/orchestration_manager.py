@@ -259,7 +259,6 @@ class OrchestrationManager:
         Execute the Magentic workflow for the provided user and task description.
         """
         job_id = str(uuid.uuid4())
-        orchestration_config.set_approval_pending(job_id)
         self.logger.info(
             "Starting orchestration job '%s' for user '%s'", job_id, user_id
         )
@@ -333,6 +332,7 @@ class OrchestrationManager:
         task_text = getattr(input_task, "description", str(input_task))
         self.logger.debug("Task: %s", task_text)
 
+        orchestration_config.set_approval_pending(job_id)
         try:
             # Execute workflow using run_stream with task as positional parameter
             # The execution settings are configured in the manager/client
@@ -448,3 +448,5 @@ class OrchestrationManager:
             except Exception as send_error:
                 self.logger.error("Failed to send error status: %s", send_error)
             raise
+        finally:
+            orchestration_config.cleanup_approval(job_id)
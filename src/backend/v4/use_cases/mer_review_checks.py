@@ -13,6 +13,7 @@ import re
 from dataclasses import dataclass
 from datetime import date
 from decimal import Decimal, InvalidOperation
+from functools import lru_cache
 from typing import Iterable
 
 from src.backend.v4.integrations.qbo_reports import ReportLineItem
@@ -41,6 +42,9 @@ _MONTHS = {
     "dec": 12,
 }
 
+# "Nov. 2025" / "November 2025" (group 1), or "27 Dec 2025" read as Dec 2025 (group 2).
+_MONTH_HEADER_RE = re.compile(r"\s*(?:([a-z]{3,9})\.?|\d{1,2}\s+([a-z]{3,9}))\s+(\d{4})\b")
+
 
 def parse_mer_month_header(text: str) -> date | None:
     """Parse headers like 'Nov. 2025' or 'November 2025' into a date.
@@ -51,33 +55,15 @@ def parse_mer_month_header(text: str) -> date | None:
     if not text:
         return None
 
-    s = text.strip().lower()
-
-    # Pattern A: "Nov. 2025", "Nov 2025", "November 2025"
-    m1 = re.search(r"^\s*([a-z]{3,9})\.?\s+(\d{4})\b", s)
-    if m1:
-        mon_token = (
-            m1.group(1)[:4] if m1.group(1).startswith("sept") else m1.group(1)[:3]
-        )
-        mon = _MONTHS.get(mon_token)
-        if not mon:
-            return None
-        year = int(m1.group(2))
-        return date(year, mon, 1)
-
-    # Pattern B: "27 Dec 2025" (treat as Dec 2025)
-    m2 = re.search(r"^\s*\d{1,2}\s+([a-z]{3,9})\s+(\d{4})\b", s)
-    if m2:
-        mon_token = (
-            m2.group(1)[:4] if m2.group(1).startswith("sept") else m2.group(1)[:3]
-        )
-        mon = _MONTHS.get(mon_token)
-        if not mon:
-            return None
-        year = int(m2.group(2))
-        return date(year, mon, 1)
+    m = _MONTH_HEADER_RE.match(text.strip().lower())
+    if not m:
+        return None
 
-    return None
+    mon_name = m.group(1) or m.group(2)
+    mon = _MONTHS.get(mon_name[:4] if mon_name.startswith("sept") else mon_name[:3])
+    if not mon:
+        return None
+    return date(int(m.group(3)), mon, 1)
 
 
 def pick_latest_month_header(headers: Iterable[str]) -> str | None:
@@ -93,6 +79,9 @@ def pick_latest_month_header(headers: Iterable[str]) -> str | None:
     return best[1] if best else None
 
 
+_MONEY_STRIP = str.maketrans("", "", "$, ")
+
+
 def parse_money(value: str | None) -> Decimal | None:
     """Parse common accounting strings into Decimal.
 
@@ -105,8 +94,14 @@ def parse_money(value: str | None) -> Decimal | None:
 
     if value is None:
         return None
+    return _parse_money_text(str(value))
+
 
-    s = str(value).strip()
+# The same amount strings recur across rules and reports; Decimal is immutable,
+# so cached results are safe to share.
+@lru_cache(maxsize=8192)
+def _parse_money_text(text: str) -> Decimal | None:
+    s = text.strip()
     if s == "" or s.lower() in {"-", "n/a", "na"}:
         return None
 
@@ -115,10 +110,16 @@ def parse_money(value: str | None) -> Decimal | None:
         negative = True
         s = s[1:-1].strip()
 
-    # Remove currency symbols and commas
-    s = re.sub(r"[^0-9.\-]", "", s)
-    if s == "":
-        return None
+    # Fast path: dropping "$", "," and spaces usually leaves a plain number, so
+    # skip the regex scrub below unless something else remains.
+    plain = s.translate(_MONEY_STRIP)
+    if plain.isascii() and plain.lstrip("-").replace(".", "", 1).isdigit():
+        s = plain
+    else:
+        # Remove currency symbols and commas
+        s = re.sub(r"[^0-9.\-]", "", s)
+        if s == "":
+            return None
 
     try:
         amount = Decimal(s)
@@ -142,18 +143,9 @@ def check_clearing_accounts_zero(
 ) -> CheckResult:
     """UC-01 (simplified): any Balance Sheet line containing 'clearing account' must be 0."""
 
-    matches: list[dict] = []
-    for item in balance_sheet_items:
-        if label_substring.lower() in item.label.lower():
-            amt = parse_money(item.amount)
-            matches.append(
-                {
-                    "label": item.label,
-                    "amount_raw": item.amount,
-                    "amount": str(amt) if amt is not None else None,
-                    "is_zero": is_zero(amt, tolerance=tolerance),
-                }
-            )
+    matches = _collect_item_matches_by_substring(
+        items=balance_sheet_items, label_substring=label_substring, tolerance=tolerance
+    )
 
     applicable = bool(matches)
     passed = (not applicable) or all(m["is_zero"] for m in matches)
@@ -178,20 +170,9 @@ def check_undeposited_funds_zero(
     """UC-03: Undeposited Funds should be 0."""
 
     # QBO label can vary slightly; start with substring.
-    candidates = [
-        item for item in balance_sheet_items if "undeposited" in item.label.lower()
-    ]
-    matches: list[dict] = []
-    for item in candidates:
-        amt = parse_money(item.amount)
-        matches.append(
-            {
-                "label": item.label,
-                "amount_raw": item.amount,
-                "amount": str(amt) if amt is not None else None,
-                "is_zero": is_zero(amt, tolerance=tolerance),
-            }
-        )
+    matches = _collect_item_matches_by_substring(
+        items=balance_sheet_items, label_substring="undeposited", tolerance=tolerance
+    )
 
     applicable = bool(matches)
 
@@ -241,9 +222,10 @@ def _collect_line_matches_by_substring(
     label_substring: str,
     tolerance: Decimal,
 ) -> list[dict]:
+    needle = label_substring.casefold()
     matches: list[dict] = []
     for label, amount_raw in items:
-        if label_substring.lower() in (label or "").lower():
+        if needle in (label or "").casefold():
             amt = parse_money(amount_raw)
             matches.append(
                 {
@@ -256,6 +238,50 @@ def _collect_line_matches_by_substring(
     return matches
 
 
+def group_items_by_label_substrings(
+    items: Iterable[ReportLineItem], label_substrings: Iterable[str]
+) -> dict[str, list[ReportLineItem]]:
+    """Bucket items by each substring their label contains (case-insensitive).
+
+    One pass over `items` serves every substring, so several substring checks on
+    the same Balance Sheet don't each rescan it. Keys are the casefolded
+    substrings; empty substrings are ignored.
+    """
+
+    needles = tuple(dict.fromkeys(sub.casefold() for sub in label_substrings if sub))
+    groups: dict[str, list[ReportLineItem]] = {needle: [] for needle in needles}
+    for item in items:
+        label_ci = item.label_ci
+        for needle in needles:
+            if needle in label_ci:
+                groups[needle].append(item)
+    return groups
+
+
+def _collect_item_matches_by_substring(
+    *,
+    items: Iterable[ReportLineItem],
+    label_substring: str,
+    tolerance: Decimal,
+) -> list[dict]:
+    """Like `_collect_line_matches_by_substring`, matching on cached `label_ci`."""
+
+    needle = label_substring.casefold()
+    matches: list[dict] = []
+    for item in items:
+        if needle in item.label_ci:
+            amt = parse_money(item.amount)
+            matches.append(
+                {
+                    "label": item.label,
+                    "amount_raw": item.amount,
+                    "amount": str(amt) if amt is not None else None,
+                    "is_zero": is_zero(amt, tolerance=tolerance),
+                }
+            )
+    return matches
+
+
 def check_reconciled_zero_by_substring(
     *,
     check_id: str,
@@ -280,10 +306,8 @@ def check_reconciled_zero_by_substring(
     mer_matches = _collect_line_matches_by_substring(
         items=mer_lines, label_substring=label_substring, tolerance=tolerance
     )
-    qbo_matches = _collect_line_matches_by_substring(
-        items=((i.label, i.amount) for i in qbo_lines),
-        label_substring=label_substring,
-        tolerance=tolerance,
+    qbo_matches = _collect_item_matches_by_substring(
+        items=qbo_lines, label_substring=label_substring, tolerance=tolerance
     )
 
     applicable = bool(mer_matches)
@@ -330,10 +354,8 @@ def check_zero_on_both_sides_by_substring(
     mer_matches = _collect_line_matches_by_substring(
         items=mer_lines, label_substring=label_substring, tolerance=tolerance
     )
-    qbo_matches = _collect_line_matches_by_substring(
-        items=((i.label, i.amount) for i in qbo_lines),
-        label_substring=label_substring,
-        tolerance=tolerance,
+    qbo_matches = _collect_item_matches_by_substring(
+        items=qbo_lines, label_substring=label_substring, tolerance=tolerance
     )
 
     mer_found = bool(mer_matches)
@@ -10,12 +10,16 @@ This module intentionally avoids FastAPI types/exceptions.
 
 from __future__ import annotations
 
+import copy
 import os
-from dataclasses import dataclass
+import re
+from dataclasses import dataclass, field
 from decimal import Decimal
-from typing import Any, Callable
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable
 
 from src.backend.v4.integrations.qbo_reports import (
+    ReportLineItem,
     extract_aged_detail_items_over_threshold,
     extract_report_total_value,
     find_first_amount,
@@ -24,18 +28,19 @@ from src.backend.v4.use_cases.mer_review_checks import (
     check_bank_balance_matches,
     check_petty_cash_matches,
     check_zero_on_both_sides_by_substring,
+    group_items_by_label_substrings,
     parse_money,
 )
-from src.backend.v4.integrations.google_sheets_reader import (
-    find_value_in_table,
-    find_values_for_rows_containing,
-)
+
+if TYPE_CHECKING:
+    from src.backend.v4.integrations.google_sheets_reader import SheetRowMatch
 
 
 def _norm_text(s: str | None) -> str:
     return "".join(ch.lower() for ch in (s or "") if ch.isalnum())
 
 
+@lru_cache(maxsize=256)
 def _col_to_a1(col_index_zero_based: int) -> str:
     if col_index_zero_based < 0:
         raise ValueError("col_index_zero_based must be >= 0")
@@ -115,6 +120,10 @@ def _looks_like_link(s: str | None) -> bool:
     )
 
 
+# Loan-like MER row labels (plain substrings, matched against lowercased labels).
+_LOAN_LABEL_RE = re.compile(r"loan|line of credit|credit line|loc|note payable|mortgage|debt")
+
+
 def _is_non_line_item_label(label: str) -> bool:
     ll = (label or "").strip().lower()
     if not ll:
@@ -152,6 +161,73 @@ class MERBalanceSheetEvaluationContext:
     qbo_bank_label_substring: str | None = None
     client_maintenance_rows: list[list[str]] | None = None
     kyc_rows: list[list[str]] | None = None
+    # Filled in by MERBalanceSheetRuleEngine.evaluate: QBO items grouped by casefolded label substring.
+    qbo_items_by_label_substring: dict[str, list[ReportLineItem]] | None = None
+    # Filled in by MERBalanceSheetRuleEngine.evaluate: MER selected-month matches per label substring.
+    mer_matches_by_label_substring: dict[str, list[SheetRowMatch]] | None = None
+    # MER column positions, resolved once from the header row in __post_init__.
+    mer_month_col_index: int | None = field(init=False, repr=False, compare=False)
+    mer_comments_col: tuple[int | None, str] = field(init=False, repr=False, compare=False)
+    # Per-MER-row columns, parallel to mer_rows: column-A label (raw and lowercased),
+    # the selected-month cell (None when the row is short or the month is unresolved)
+    # and its parsed amount, and whether the comments cell is non-blank.
+    mer_labels: tuple[Any, ...] = field(init=False, repr=False, compare=False)
+    mer_labels_lower: tuple[str, ...] = field(init=False, repr=False, compare=False)
+    mer_month_amounts_raw: tuple[Any, ...] = field(init=False, repr=False, compare=False)
+    mer_month_amounts: tuple[Decimal | None, ...] = field(init=False, repr=False, compare=False)
+    mer_comment_present: tuple[bool, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self,
+            "mer_month_col_index",
+            _find_col_index_by_header_contains(
+                rows=self.mer_rows,
+                header_row_index=self.mer_header_row_index,
+                header_contains=self.mer_selected_month_header,
+            ),
+        )
+        comments_col, comments_col_mode = _resolve_mer_comments_col_index(
+            rows=self.mer_rows, header_row_index=self.mer_header_row_index
+        )
+        object.__setattr__(self, "mer_comments_col", (comments_col, comments_col_mode))
+
+        month_col = self.mer_month_col_index
+        labels: list[Any] = []
+        labels_lower: list[str] = []
+        amounts_raw: list[Any] = []
+        comment_present: list[bool] = []
+        for row in self.mer_rows:
+            row = row or []
+            label = (row[0] if row else "") or ""
+            labels.append(label)
+            labels_lower.append(str(label).lower())
+            amounts_raw.append(
+                row[month_col] if month_col is not None and month_col < len(row) else None
+            )
+            comment_raw = (
+                row[comments_col] if comments_col is not None and comments_col < len(row) else None
+            )
+            comment_present.append(bool(str(comment_raw or "").strip()))
+        object.__setattr__(self, "mer_labels", tuple(labels))
+        object.__setattr__(self, "mer_labels_lower", tuple(labels_lower))
+        object.__setattr__(self, "mer_month_amounts_raw", tuple(amounts_raw))
+        object.__setattr__(self, "mer_month_amounts", tuple(map(parse_money, amounts_raw)))
+        object.__setattr__(self, "mer_comment_present", tuple(comment_present))
+
+    def qbo_lines_containing(self, label_substring: str) -> Any:
+        """QBO Balance Sheet items that may contain `label_substring`.
+
+        Returns the pre-grouped items when available, else all items; callers
+        still apply their own substring match, so either is correct.
+        """
+
+        groups = self.qbo_items_by_label_substring
+        if groups:
+            matched = groups.get(label_substring.casefold())
+            if matched is not None:
+                return matched
+        return self.qbo_balance_sheet_items
 
 
 EvaluationHandler = Callable[[dict[str, Any], MERBalanceSheetEvaluationContext], dict[str, Any]]
@@ -168,6 +244,18 @@ def _extract_rule_required_sources(rule: dict[str, Any]) -> list[str]:
     return sorted(set(out))
 
 
+def _walk_for_actions(obj: Any, out: set[str]) -> None:
+    if isinstance(obj, dict):
+        act = obj.get("action")
+        if isinstance(act, str) and act.strip():
+            out.add(act.strip())
+        for v in obj.values():
+            _walk_for_actions(v, out)
+    elif isinstance(obj, list):
+        for v in obj:
+            _walk_for_actions(v, out)
+
+
 def _extract_rule_action_items(rule: dict[str, Any]) -> list[str]:
     actions: set[str] = set()
 
@@ -178,27 +266,16 @@ def _extract_rule_action_items(rule: dict[str, Any]) -> list[str]:
     if isinstance(sop, dict) and bool(sop.get("required_step")):
         actions.add("required_manual_review_step")
 
-    def _walk(obj: Any) -> None:
-        if isinstance(obj, dict):
-            act = obj.get("action")
-            if isinstance(act, str) and act.strip():
-                actions.add(act.strip())
-            for v in obj.values():
-                _walk(v)
-        elif isinstance(obj, list):
-            for v in obj:
-                _walk(v)
-
     pa = rule.get("process_actions")
     if pa is not None:
-        _walk(pa)
+        _walk_for_actions(pa, actions)
 
     return sorted(actions)
 
 
 class EvaluationRegistry:
-    def __init__(self) -> None:
-        self._handlers: dict[str, EvaluationHandler] = {}
+    def __init__(self, handlers: dict[str, EvaluationHandler] | None = None) -> None:
+        self._handlers: dict[str, EvaluationHandler] = dict(handlers or {})
 
     def register(self, eval_type: str) -> Callable[[EvaluationHandler], EvaluationHandler]:
         def _decorator(fn: EvaluationHandler) -> EvaluationHandler:
@@ -219,17 +296,6 @@ def collect_action_items(rulebook_doc: dict[str, Any]) -> list[dict[str, Any]]:
     if not isinstance(rules, list):
         return []
 
-    def _walk_for_actions(obj: Any, out: set[str]) -> None:
-        if isinstance(obj, dict):
-            act = obj.get("action")
-            if isinstance(act, str) and act.strip():
-                out.add(act.strip())
-            for v in obj.values():
-                _walk_for_actions(v, out)
-        elif isinstance(obj, list):
-            for v in obj:
-                _walk_for_actions(v, out)
-
     items: list[dict[str, Any]] = []
     limit = max(int(os.environ.get("MER_AGENT_ACTION_ITEMS_LIMIT", "10")), 0)
 
@@ -240,25 +306,13 @@ def collect_action_items(rulebook_doc: dict[str, Any]) -> list[dict[str, Any]]:
         if not rid:
             continue
 
-        actions: set[str] = set()
-
-        if bool(r.get("manual_attestation_required")):
-            actions.add("manual_attestation_required")
-
-        sop = r.get("sop_expectation")
-        if isinstance(sop, dict) and bool(sop.get("required_step")):
-            actions.add("required_manual_review_step")
-
-        pa = r.get("process_actions")
-        if pa is not None:
-            _walk_for_actions(pa, actions)
-
+        actions = _extract_rule_action_items(r)
         if actions:
             items.append(
                 {
                     "rule_id": str(rid),
                     "title": str(r.get("title") or ""),
-                    "actions": sorted(actions),
+                    "actions": actions,
                 }
             )
 
@@ -269,43 +323,62 @@ def collect_action_items(rulebook_doc: dict[str, Any]) -> list[dict[str, Any]]:
 
 
 class MERBalanceSheetRuleEngine:
-    """Evaluate Balance Sheet rules from the YAML rulebook."""
+    """Evaluate Balance Sheet rules from the YAML rulebook.
+
+    Holds only its handler registry; evaluation state lives in the context
+    passed to `evaluate`, so one engine can be shared across requests.
+    """
+
+    __slots__ = ("_registry",)
 
     def __init__(self, registry: EvaluationRegistry | None = None) -> None:
-        self._registry = registry or _default_registry()
+        # The built-in handler table is built once per process; each engine gets
+        # its own registry copy so register() calls stay local to that engine.
+        self._registry = registry or EvaluationRegistry(_default_handlers())
 
     @property
     def registry(self) -> EvaluationRegistry:
         return self._registry
 
-    def evaluate(self, *, rulebook: dict[str, Any], ctx: MERBalanceSheetEvaluationContext) -> list[dict[str, Any]]:
+    def evaluate(
+        self,
+        *,
+        rulebook: dict[str, Any],
+        ctx: MERBalanceSheetEvaluationContext,
+        compiled: tuple[CompiledRule, ...] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Evaluate every rule in `rulebook` against `ctx`.
+
+        `compiled` may be passed as `compile_rulebook(rulebook)` precomputed for
+        this rulebook; otherwise it is compiled here.
+        """
+
         results: list[dict[str, Any]] = []
 
-        rules = rulebook.get("rules") or []
-        if not isinstance(rules, list):
+        specs = compiled if compiled is not None else compile_rulebook(rulebook)
+        if not specs:
             return results
 
-        for rule in rules:
-            if not isinstance(rule, dict):
-                continue
-
-            if rule.get("enabled") is False:
+        ctx = _with_rule_lookups(specs, ctx)
+        get_handler = self._registry.get
+        for spec in specs:
+            rule_id = spec.rule_id
+            eval_type = spec.eval_type
+            if not spec.enabled:
                 results.append(
                     {
-                        "rule_id": rule.get("rule_id"),
+                        "rule_id": rule_id,
                         "status": "skipped",
                         "reason": "disabled_by_rulebook",
-                        "evaluation_type": ((rule.get("evaluation") or {}).get("type")),
+                        "evaluation_type": eval_type,
                     }
                 )
                 continue
 
-            rule_id = rule.get("rule_id")
-            eval_type = (rule.get("evaluation") or {}).get("type")
             if not rule_id or not eval_type:
                 continue
 
-            handler = self._registry.get(str(eval_type))
+            handler = get_handler(str(eval_type))
             if handler is None:
                 results.append(
                     {
@@ -316,7 +389,7 @@ class MERBalanceSheetRuleEngine:
                 )
                 continue
 
-            out = handler(rule, ctx)
+            out = handler(spec.rule, ctx)
             # Normalize the result payload shape.
             out.setdefault("rule_id", rule_id)
             out.setdefault("evaluation_type", eval_type)
@@ -325,9 +398,207 @@ class MERBalanceSheetRuleEngine:
         return results
 
 
+class _QBOReportCache:
+    """Per-evaluation proxy over a QBO client that fetches each report once.
+
+    Several rules read the same AP/AR reports and account list; successful
+    calls to the methods below are memoised by their arguments so later rules
+    don't re-issue them. Errors are not cached (a timeout or 5xx may succeed on
+    the next rule's attempt), and calls with unhashable arguments go straight
+    through. Everything else is passed through to the wrapped client.
+    """
+
+    _CACHED_METHODS = frozenset(
+        {
+            "get_accounts",
+            "get_aged_payables_total",
+            "get_aged_receivables_total",
+            "get_aged_payables_detail",
+            "get_aged_receivables_detail",
+        }
+    )
+
+    def __init__(self, client: Any) -> None:
+        self._client = client
+        self._results: dict[tuple[Any, ...], Any] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if name not in self._CACHED_METHODS:
+            return attr
+
+        def _cached(*args: Any, **kwargs: Any) -> Any:
+            try:
+                key = (name, args, frozenset(kwargs.items()))
+                if key in self._results:
+                    return self._results[key]
+            except TypeError:
+                return attr(*args, **kwargs)
+            value = attr(*args, **kwargs)
+            self._results[key] = value
+            return value
+
+        return _cached
+
+
+def _first_label_substring(rule: dict[str, Any]) -> str | None:
+    substrings = (
+        ((rule.get("applies_to") or {}).get("qbo_balance_sheet_lines") or {})
+        .get("label_contains_any")
+        or []
+    )
+    if not isinstance(substrings, list) or not substrings:
+        return None
+    return str(substrings[0])
+
+
+def _matching_qbo_items(
+    ctx: MERBalanceSheetEvaluationContext, label_substring: str
+) -> list[ReportLineItem]:
+    """QBO Balance Sheet items whose label contains `label_substring` (case-insensitive)."""
+
+    needle = label_substring.casefold()
+    return [item for item in ctx.qbo_lines_containing(label_substring) if needle in item.label_ci]
+
+
+# Evaluation types that look up QBO lines by their first `label_contains_any` entry.
+_LABEL_SUBSTRING_EVAL_TYPES = frozenset(
+    {
+        "balance_sheet_line_items_must_be_zero",
+        "mer_line_amount_matches_qbo_line_amount",
+    }
+)
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledRule:
+    """Dispatch fields of one rulebook rule, read once per rulebook."""
+
+    rule: dict[str, Any]
+    rule_id: Any
+    eval_type: Any
+    enabled: bool
+    # First `label_contains_any` entry, for the substring-based evaluation types.
+    label_substring: str | None
+
+
+def compile_rulebook(rulebook: dict[str, Any]) -> tuple[CompiledRule, ...]:
+    """Pre-extract the per-rule dispatch fields of `rulebook`.
+
+    The result can be passed to `MERBalanceSheetRuleEngine.evaluate` for as
+    long as the rulebook is unchanged (e.g. cached next to the parsed YAML).
+    """
+
+    rules = rulebook.get("rules") or []
+    if not isinstance(rules, list):
+        return ()
+
+    compiled: list[CompiledRule] = []
+    for rule in rules:
+        if not isinstance(rule, dict):
+            continue
+        eval_type = (rule.get("evaluation") or {}).get("type")
+        compiled.append(
+            CompiledRule(
+                rule=rule,
+                rule_id=rule.get("rule_id"),
+                eval_type=eval_type,
+                enabled=rule.get("enabled") is not False,
+                label_substring=(
+                    _first_label_substring(rule)
+                    if eval_type in _LABEL_SUBSTRING_EVAL_TYPES
+                    else None
+                ),
+            )
+        )
+    return tuple(compiled)
+
+
+def _with_rule_lookups(
+    specs: tuple[CompiledRule, ...], ctx: MERBalanceSheetEvaluationContext
+) -> MERBalanceSheetEvaluationContext:
+    """Build the per-evaluation lookups shared by every rule of the same type.
+
+    QBO items and MER rows are each scanned once for all label substrings the
+    rulebook's substring-based rules will ask for, and the QBO client is
+    wrapped so each report is fetched once. The result is a shallow copy of
+    `ctx` made without re-running `__post_init__`, so the derived MER columns
+    are carried over rather than recomputed.
+    """
+
+    updates: dict[str, Any] = {}
+
+    substrings = [spec.label_substring for spec in specs if spec.enabled and spec.label_substring]
+
+    if substrings and ctx.mer_matches_by_label_substring is None:
+        from src.backend.v4.integrations.google_sheets_reader import (
+            find_values_for_rows_containing_any,
+        )
+
+        updates["mer_matches_by_label_substring"] = find_values_for_rows_containing_any(
+            rows=ctx.mer_rows,
+            row_substrings=substrings,
+            col_header=ctx.mer_selected_month_header,
+            header_row_index=ctx.mer_header_row_index,
+        )
+
+    items = ctx.qbo_balance_sheet_items
+    qbo_substrings = list(substrings)
+    if ctx.qbo_bank_label_substring:
+        qbo_substrings.append(ctx.qbo_bank_label_substring)
+    if (
+        qbo_substrings
+        and ctx.qbo_items_by_label_substring is None
+        and isinstance(items, (list, tuple))
+        and all(isinstance(item, ReportLineItem) for item in items)
+    ):
+        updates["qbo_items_by_label_substring"] = group_items_by_label_substrings(
+            items, qbo_substrings
+        )
+
+    if ctx.qbo_client is not None and not isinstance(ctx.qbo_client, _QBOReportCache):
+        updates["qbo_client"] = _QBOReportCache(ctx.qbo_client)
+
+    if not updates:
+        return ctx
+    derived = copy.copy(ctx)
+    for name, value in updates.items():
+        object.__setattr__(derived, name, value)
+    return derived
+
+
+@lru_cache(maxsize=1)
+def _default_handlers() -> dict[str, EvaluationHandler]:
+    """Built-in evaluation-type dispatch table, built on first use."""
+
+    return dict(_default_registry()._handlers)
+
+
 def _default_registry() -> EvaluationRegistry:
+    # Deferred so importing the engine (e.g. for the context type) doesn't load
+    # the Sheets integration and its .env side effects; this runs once per process.
+    from src.backend.v4.integrations.google_sheets_reader import (
+        find_value_in_table,
+        find_values_for_rows_containing,
+    )
+
     reg = EvaluationRegistry()
 
+    def _mer_rows_containing(
+        ctx: MERBalanceSheetEvaluationContext, substring: str
+    ) -> list[SheetRowMatch]:
+        # Substring rules' MER matches are precomputed by evaluate(); other callers scan here.
+        if ctx.mer_matches_by_label_substring is not None:
+            matches = ctx.mer_matches_by_label_substring.get(substring)
+            if matches is not None:
+                return matches
+        return find_values_for_rows_containing(
+            rows=ctx.mer_rows,
+            row_substring=substring,
+            col_header=ctx.mer_selected_month_header,
+            header_row_index=ctx.mer_header_row_index,
+        )
+
     # --- Human / external-evidence required handlers ---
 
     @reg.register("requires_external_reconciliation_verification")
@@ -424,15 +695,8 @@ def _default_registry() -> EvaluationRegistry:
         rule: dict[str, Any], ctx: MERBalanceSheetEvaluationContext
     ) -> dict[str, Any]:
         # Convention: MER Balance Sheet comments are in column F.
-        comments_col, comments_col_mode = _resolve_mer_comments_col_index(
-            rows=ctx.mer_rows,
-            header_row_index=ctx.mer_header_row_index,
-        )
-        month_col = _find_col_index_by_header_contains(
-            rows=ctx.mer_rows,
-            header_row_index=ctx.mer_header_row_index,
-            header_contains=ctx.mer_selected_month_header,
-        )
+        comments_col, comments_col_mode = ctx.mer_comments_col
+        month_col = ctx.mer_month_col_index
 
         if comments_col is None or month_col is None:
             return {
@@ -456,30 +720,28 @@ def _default_registry() -> EvaluationRegistry:
         missing: list[dict[str, Any]] = []
         applicable_count = 0
 
+        zero_tolerance = ctx.zero_tolerance
         start = (ctx.mer_header_row_index or 0) + 1
         for row_index in range(start, len(ctx.mer_rows)):
-            row = ctx.mer_rows[row_index] or []
-            label = (row[0] if row else "") or ""
+            label = ctx.mer_labels[row_index]
             if _is_non_line_item_label(label):
                 continue
 
-            amount_raw = row[month_col] if month_col < len(row) else None
-            amount = parse_money(amount_raw)
+            amount = ctx.mer_month_amounts[row_index]
             if amount is None:
                 continue
-            if abs(amount) <= ctx.zero_tolerance:
+            if abs(amount) <= zero_tolerance:
                 continue
 
             applicable_count += 1
-            comment_raw = row[comments_col] if comments_col < len(row) else None
-            comment_present = bool((comment_raw or "").strip())
+            comment_present = ctx.mer_comment_present[row_index]
 
             if not comment_present:
                 missing.append(
                     {
                         "mer_row_index": row_index,
                         "mer_label": label,
-                        "mer_amount_raw": amount_raw,
+                        "mer_amount_raw": ctx.mer_month_amounts_raw[row_index],
                         "mer_amount": str(amount),
                         "comments_a1_cell": _a1_cell(row_index, comments_col),
                     }
@@ -529,15 +791,8 @@ def _default_registry() -> EvaluationRegistry:
                 },
             }
 
-        comments_col, comments_col_mode = _resolve_mer_comments_col_index(
-            rows=ctx.mer_rows,
-            header_row_index=ctx.mer_header_row_index,
-        )
-        month_col = _find_col_index_by_header_contains(
-            rows=ctx.mer_rows,
-            header_row_index=ctx.mer_header_row_index,
-            header_contains=ctx.mer_selected_month_header,
-        )
+        comments_col, comments_col_mode = ctx.mer_comments_col
+        month_col = ctx.mer_month_col_index
         if comments_col is None or month_col is None:
             return {
                 "status": "failed",
@@ -561,48 +816,37 @@ def _default_registry() -> EvaluationRegistry:
         rid = str(rule.get("rule_id") or "").upper()
 
         # For loan schedule link checks, scope to loan-like rows.
-        loan_tokens = [
-            "loan",
-            "line of credit",
-            "credit line",
-            "loc",
-            "note payable",
-            "mortgage",
-            "debt",
-        ]
         is_loan_rule = ("loan" in rid) or ("loan" in title) or ("repayment" in title) or ("schedule" in title)
 
         missing: list[dict[str, Any]] = []
         applicable_count = 0
 
+        zero_tolerance = ctx.zero_tolerance
         start = (ctx.mer_header_row_index or 0) + 1
         for row_index in range(start, len(ctx.mer_rows)):
-            row = ctx.mer_rows[row_index] or []
-            label = (row[0] if row else "") or ""
+            label = ctx.mer_labels[row_index]
             if _is_non_line_item_label(label):
                 continue
 
-            amount_raw = row[month_col] if month_col < len(row) else None
-            amount = parse_money(amount_raw)
+            amount = ctx.mer_month_amounts[row_index]
             if amount is None:
                 continue
-            if abs(amount) <= ctx.zero_tolerance:
+            if abs(amount) <= zero_tolerance:
                 continue
 
-            label_l = label.lower()
-            if is_loan_rule and not any(tok in label_l for tok in loan_tokens):
+            label_l = ctx.mer_labels_lower[row_index]
+            if is_loan_rule and not _LOAN_LABEL_RE.search(label_l):
                 continue
 
             applicable_count += 1
-            comment_raw = row[comments_col] if comments_col < len(row) else None
-            comment_present = bool((comment_raw or "").strip())
+            comment_present = ctx.mer_comment_present[row_index]
 
             if not comment_present:
                 missing.append(
                     {
                         "mer_row_index": row_index,
                         "mer_label": label,
-                        "mer_amount_raw": amount_raw,
+                        "mer_amount_raw": ctx.mer_month_amounts_raw[row_index],
                         "mer_amount": str(amount),
                         "comments_a1_cell": _a1_cell(row_index, comments_col),
                     }
@@ -755,7 +999,11 @@ def _default_registry() -> EvaluationRegistry:
             }
 
         qbo_names = [str(a.get("Name") or "") for a in (qbo_accounts or []) if isinstance(a, dict)]
-        qbo_norm = {_norm_name(n): n for n in qbo_names if _norm_name(n)}
+        qbo_norm = frozenset(nn for nn in map(_norm_name, qbo_names) if nn)
+
+        mer_start = (ctx.mer_header_row_index or 0) + 1
+        mer_labels_lower = ctx.mer_labels_lower[mer_start:]
+        mer_label_set = frozenset(label_l.strip() for label_l in mer_labels_lower)
 
         def _qbo_has_account(name: str) -> bool:
             nn = _norm_name(name)
@@ -764,18 +1012,16 @@ def _default_registry() -> EvaluationRegistry:
             if nn in qbo_norm:
                 return True
             # fallback: substring match (client naming differences)
-            return any(nn in qn or qn in nn for qn in qbo_norm.keys())
+            return any(nn in qn or qn in nn for qn in qbo_norm)
 
         def _mer_has_line(name: str) -> bool:
             needle = (name or "").strip().lower()
             if not needle:
                 return False
-            start = (ctx.mer_header_row_index or 0) + 1
-            for row in ctx.mer_rows[start:]:
-                label = str((row or [""])[0] or "")
-                if needle in label.lower():
-                    return True
-            return False
+            # Exact label hits are a set lookup; only misses pay for the substring scan.
+            if needle in mer_label_set:
+                return True
+            return any(needle in label_l for label_l in mer_labels_lower)
 
         findings: list[dict[str, Any]] = []
         missing_qbo = 0
@@ -843,17 +1089,12 @@ def _default_registry() -> EvaluationRegistry:
             }
 
         substring = str(substrings[0])
-        mer_matches = find_values_for_rows_containing(
-            rows=ctx.mer_rows,
-            row_substring=substring,
-            col_header=ctx.mer_selected_month_header,
-            header_row_index=ctx.mer_header_row_index,
-        )
+        mer_matches = _mer_rows_containing(ctx, substring)
 
         check = check_zero_on_both_sides_by_substring(
             check_id=str(rule.get("rule_id") or ""),
             mer_lines=[(m.row_text, m.value) for m in mer_matches],
-            qbo_lines=ctx.qbo_balance_sheet_items,
+            qbo_lines=_matching_qbo_items(ctx, substring),
             label_substring=substring,
             tolerance=ctx.zero_tolerance,
             rule=rule.get("title") or "Balance sheet line items must be zero",
@@ -879,13 +1120,9 @@ def _default_registry() -> EvaluationRegistry:
             }
 
         substring = str(substrings[0])
-        mer_candidates = find_values_for_rows_containing(
-            rows=ctx.mer_rows,
-            row_substring=substring,
-            col_header=ctx.mer_selected_month_header,
-            header_row_index=ctx.mer_header_row_index,
-        )
-        qbo_raw = find_first_amount(ctx.qbo_balance_sheet_items, substring)
+        mer_candidates = _mer_rows_containing(ctx, substring)
+        qbo_matches = _matching_qbo_items(ctx, substring)
+        qbo_raw = qbo_matches[0].amount if qbo_matches else None
         qbo_amount = parse_money(qbo_raw)
 
         if len(mer_candidates) != 1:
@@ -944,7 +1181,9 @@ def _default_registry() -> EvaluationRegistry:
             header_row_index=ctx.mer_header_row_index,
         )
         mer_amount = parse_money(mer_lookup.value)
-        qbo_raw = find_first_amount(ctx.qbo_balance_sheet_items, str(qbo_bank_label_substring))
+        qbo_raw = find_first_amount(
+            ctx.qbo_lines_containing(str(qbo_bank_label_substring)), str(qbo_bank_label_substring)
+        )
         qbo_amount = parse_money(qbo_raw)
         check = check_bank_balance_matches(
             mer_amount=mer_amount,
@@ -1016,11 +1255,11 @@ def _default_registry() -> EvaluationRegistry:
                 "petty cash",
             ]
 
-        include_lowered = [str(k).strip().lower() for k in include_tokens if isinstance(k, str) and k.strip()]
-        exclude_lowered = [str(k).strip().lower() for k in exclude_tokens if isinstance(k, str) and k.strip()]
+        include_lowered = [str(k).strip().casefold() for k in include_tokens if isinstance(k, str) and k.strip()]
+        exclude_lowered = [str(k).strip().casefold() for k in exclude_tokens if isinstance(k, str) and k.strip()]
 
-        def _is_reconcilable_label(label: str) -> bool:
-            ll = (label or "").strip().lower()
+        def _is_reconcilable_label(label_ci: str) -> bool:
+            ll = label_ci.strip()
             if not ll:
                 return False
             if "undeposited" in ll:
@@ -1029,11 +1268,16 @@ def _default_registry() -> EvaluationRegistry:
                 return False
             return any(tok in ll for tok in include_lowered)
 
+        def _label_ci(it: Any) -> str:
+            # ReportLineItem carries a casefolded label; other item shapes fold here.
+            cached = getattr(it, "label_ci", None)
+            return cached if cached is not None else str(getattr(it, "label", "") or "").casefold()
+
         items = ctx.qbo_balance_sheet_items or []
         candidates = [
             it
             for it in items
-            if hasattr(it, "label") and _is_reconcilable_label(str(getattr(it, "label", "") or ""))
+            if hasattr(it, "label") and _is_reconcilable_label(_label_ci(it))
         ]
 
         missing_mer: list[str] = []
@@ -1237,10 +1481,7 @@ def _default_registry() -> EvaluationRegistry:
         ap_items = ap.get("items") or []
         ar_items = ar.get("items") or []
 
-        comments_col, comments_col_mode = _resolve_mer_comments_col_index(
-            rows=ctx.mer_rows,
-            header_row_index=ctx.mer_header_row_index,
-        )
+        comments_col, comments_col_mode = ctx.mer_comments_col
 
         def _mer_explanation_for(substring: str) -> dict[str, Any]:
             out: dict[str, Any] = {
@@ -1252,14 +1493,13 @@ def _default_registry() -> EvaluationRegistry:
                 out["reason"] = "missing_comments_column"
                 return out
 
+            needle = substring.lower()
             start = (ctx.mer_header_row_index or 0) + 1
             for row_index in range(start, len(ctx.mer_rows)):
-                row = ctx.mer_rows[row_index] or []
-                label = (row[0] if row else "") or ""
-                if substring.lower() not in (label or "").lower():
+                if needle not in ctx.mer_labels_lower[row_index]:
                     continue
-                comment_raw = row[comments_col] if comments_col < len(row) else None
-                comment_present = bool((comment_raw or "").strip())
+                label = ctx.mer_labels[row_index]
+                comment_present = ctx.mer_comment_present[row_index]
                 out["matched_rows"].append(
                     {
                         "mer_row_index": row_index,
@@ -12,6 +12,7 @@ from __future__ import annotations
 
 import os
 from decimal import Decimal
+from functools import lru_cache
 from typing import TYPE_CHECKING, Any
 
 from src.backend.v4.integrations.google_sheets_reader import find_values_for_rows_containing, find_value_in_table
@@ -62,17 +63,19 @@ def _is_non_line_item_label(label: str) -> bool:
     return any(kw in label_l for kw in non_item_keywords)
 
 
-def _a1_cell(row_index: int, col_index: int) -> str:
-    """Convert 0-based row/col to A1 notation (e.g., A1, B2)."""
+@lru_cache(maxsize=256)
+def _col_letter(c: int) -> str:
+    """Convert a 0-based column index to A1 column letters (0->A, 26->AA)."""
+    result = ""
+    while c >= 0:
+        result = chr(ord("A") + c % 26) + result
+        c = c // 26 - 1
+    return result
 
-    def col_letter(c: int) -> str:
-        result = ""
-        while c >= 0:
-            result = chr(ord("A") + c % 26) + result
-            c = c // 26 - 1
-        return result
 
-    return f"{col_letter(col_index)}{row_index + 1}"
+def _a1_cell(row_index: int, col_index: int) -> str:
+    """Convert 0-based row/col to A1 notation (e.g., A1, B2)."""
+    return f"{_col_letter(col_index)}{row_index + 1}"
 
 
 def _find_col_index_by_header_contains(
@@ -114,10 +117,12 @@ def _resolve_mer_comments_col_index(
 
 def find_first_amount(items: list, label_substring: str) -> str | None:
     """Find the first item matching label_substring and return its amount."""
-    target = label_substring.lower()
+    target = label_substring.casefold()
     for item in items or []:
-        label = str(getattr(item, "label", "") or "")
-        if target in label.lower():
+        label_ci = getattr(item, "label_ci", None)
+        if label_ci is None:
+            label_ci = str(getattr(item, "label", "") or "").casefold()
+        if target in label_ci:
             return str(getattr(item, "amount", "") or "")
     return None
 
@@ -612,7 +617,7 @@ def eval_balance_sheet_line_items_must_be_zero(
     check = check_zero_on_both_sides_by_substring(
         check_id=str(rule.get("rule_id") or ""),
         mer_lines=[(m.row_text, m.value) for m in mer_matches],
-        qbo_lines=ctx.qbo_balance_sheet_items,
+        qbo_lines=ctx.qbo_lines_containing(substring),
         label_substring=substring,
         tolerance=ctx.zero_tolerance,
         rule=rule.get("title") or "Balance sheet line items must be zero",